@@ -1,35 +1,13 @@
 from logging.config import fileConfig
-from sqlalchemy import pool
 from alembic import context
 import os
+import re
 
 from app.core.config import settings
 from app.db.base import Base
-from app.db.session import sync_engine
-
-# Import models so they're registered with Base
-from app.models.user import User
-from app.models.conversation import Conversation
-from app.models.message import Message
-from app.models.emotion_log import EmotionLog
-from app.models.journal_entry import JournalEntry
-from app.models.crisis_event import CrisisEvent
-from app.models.goal import (
-    Goal,
-    GoalPhase,
-    DailySchedule,
-    DailyLog,
-    PhaseTask,
-    WeeklyReview,
-    StreakFreeze
-)
-from app.models.meditation_session import MeditationSession
-from app.models.memory import (
-    ConversationContextCache,
-    SemanticMemory,
-    EmotionalProfile,
-    MetaReflection,
-)
+
+# Async driver prefixes that offline SQL generation should strip.
+_ASYNC_DRIVER_RE = re.compile(r"^(postgresql|sqlite)\+(?:asyncpg|aiosqlite)://")
 
 config = context.config
 
@@ -47,10 +25,7 @@ def run_migrations_offline() -> None:
         raise ValueError("DATABASE_URL environment variable is not set")
 
     # Convert async URLs to sync for migrations
-    if "postgresql+asyncpg://" in database_url:
-        database_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
-    if "sqlite+aiosqlite://" in database_url:
-        database_url = database_url.replace("sqlite+aiosqlite://", "sqlite://")
+    database_url = _ASYNC_DRIVER_RE.sub(r"\1://", database_url)
 
     context.configure(
         url=database_url,
@@ -63,8 +38,38 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
+def _register_models() -> None:
+    """Import models so they're registered with Base (online runs only)."""
+    from app.models.user import User
+    from app.models.conversation import Conversation
+    from app.models.message import Message
+    from app.models.emotion_log import EmotionLog
+    from app.models.journal_entry import JournalEntry
+    from app.models.crisis_event import CrisisEvent
+    from app.models.goal import (
+        Goal,
+        GoalPhase,
+        DailySchedule,
+        DailyLog,
+        PhaseTask,
+        WeeklyReview,
+        StreakFreeze
+    )
+    from app.models.meditation_session import MeditationSession
+    from app.models.memory import (
+        ConversationContextCache,
+        SemanticMemory,
+        EmotionalProfile,
+        MetaReflection,
+    )
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode using sync engine."""
+    # Deferred so offline --sql runs never build engines or load drivers.
+    from app.db.session import sync_engine
+
+    _register_models()
     with sync_engine.connect() as connection:
         context.configure(
             connection=connection,
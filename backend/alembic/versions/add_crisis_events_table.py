@@ -16,6 +16,20 @@
 branch_labels = None
 depends_on = None
 
+# crisis_service_new.CrisisService records every escalation as 'crisis'
+ACTIVE_HIGH_SEVERITY_PREDICATE = (
+    "severity = 'crisis' AND user_acknowledged IS NOT TRUE"
+)
+
+
+def _create_secondary_index(name: str, table: str, columns: list, **kw) -> None:
+    """Create a non-unique index, CONCURRENTLY on PostgreSQL so writes are not blocked."""
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, **kw)
+    else:
+        op.create_index(name, table, columns, unique=False, **kw)
+
 
 def upgrade() -> None:
     op.create_table('crisis_events',
@@ -28,9 +42,9 @@ def upgrade() -> None:
     sa.Column('keywords_detected', sa.Text(), nullable=True),
     sa.Column('response_sent', sa.Text(), nullable=True),
     sa.Column('pattern_detected', sa.String(length=255), nullable=True),
-    sa.Column('user_acknowledged', sa.Boolean(), default=False),
-    sa.Column('escalated_to_professional', sa.Boolean(), default=False),
-    sa.Column('followup_provided', sa.Boolean(), default=False),
+    sa.Column('user_acknowledged', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+    sa.Column('escalated_to_professional', sa.Boolean(), nullable=False, server_default=sa.text('false')),
+    sa.Column('followup_provided', sa.Boolean(), nullable=False, server_default=sa.text('false')),
     sa.Column('notes', sa.Text(), nullable=True),
     sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
     sa.Column('updated_at', sa.DateTime(timezone=True), onupdate=sa.text('now()')),
@@ -39,19 +53,29 @@ def upgrade() -> None:
     sa.ForeignKeyConstraint(['message_id'], ['messages.id'], ),
     sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_crisis_events_id'), 'crisis_events', ['id'], unique=False)
-    op.create_index(op.f('ix_crisis_events_user_id'), 'crisis_events', ['user_id'], unique=False)
-    op.create_index(op.f('ix_crisis_events_conversation_id'), 'crisis_events', ['conversation_id'], unique=False)
-    op.create_index(op.f('ix_crisis_events_message_id'), 'crisis_events', ['message_id'], unique=False)
-    op.create_index(op.f('ix_crisis_events_severity'), 'crisis_events', ['severity'], unique=False)
-    op.create_index(op.f('ix_crisis_events_created_at'), 'crisis_events', ['created_at'], unique=False)
+    _create_secondary_index(op.f('ix_crisis_events_id'), 'crisis_events', ['id'])
+    _create_secondary_index(op.f('ix_crisis_events_conversation_id'), 'crisis_events', ['conversation_id'])
+    _create_secondary_index(op.f('ix_crisis_events_message_id'), 'crisis_events', ['message_id'])
+    # Trend queries filter on user_id + created_at range; INCLUDE makes them index-only on PG.
+    _create_secondary_index(
+        'ix_crisis_events_user_created', 'crisis_events',
+        ['user_id', sa.text('created_at DESC')],
+        postgresql_include=['severity', 'confidence'],
+    )
+    # Unacknowledged crisis events are a small slice of the table;
+    # a partial index keeps lookups for them cache-resident.
+    _create_secondary_index(
+        'ix_crisis_events_active_high', 'crisis_events',
+        ['user_id', sa.text('created_at DESC')],
+        postgresql_where=sa.text(ACTIVE_HIGH_SEVERITY_PREDICATE),
+        sqlite_where=sa.text(ACTIVE_HIGH_SEVERITY_PREDICATE),
+    )
 
 
 def downgrade() -> None:
-    op.drop_index(op.f('ix_crisis_events_created_at'), table_name='crisis_events')
-    op.drop_index(op.f('ix_crisis_events_severity'), table_name='crisis_events')
+    op.drop_index('ix_crisis_events_user_created', table_name='crisis_events')
+    op.drop_index('ix_crisis_events_active_high', table_name='crisis_events')
     op.drop_index(op.f('ix_crisis_events_message_id'), table_name='crisis_events')
     op.drop_index(op.f('ix_crisis_events_conversation_id'), table_name='crisis_events')
-    op.drop_index(op.f('ix_crisis_events_user_id'), table_name='crisis_events')
     op.drop_index(op.f('ix_crisis_events_id'), table_name='crisis_events')
     op.drop_table('crisis_events')
@@ -0,0 +1,46 @@
+"""Composite indexes for message history and top semantic memories."""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "hot_path_composite_indexes"
+down_revision = "patterns_gin_path_ops"
+branch_labels = None
+depends_on = None
+
+# (new composite index, table, columns, single-column index it supersedes)
+COMPOSITE_INDEXES = [
+    (
+        "ix_messages_conversation_created",
+        "messages",
+        ["conversation_id", "created_at"],
+        ("ix_messages_conversation_id", ["conversation_id"]),
+    ),
+    (
+        "ix_semantic_memories_user_importance",
+        "semantic_memories",
+        ["user_id", sa.text("importance_score DESC")],
+        ("ix_semantic_memories_user_id", ["user_id"]),
+    ),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        # Build each composite before dropping the index it covers, so the
+        # foreign key column is never left unindexed.
+        with op.get_context().autocommit_block():
+            for name, table, columns, (old_name, _old_columns) in COMPOSITE_INDEXES:
+                op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {old_name}")
+    else:
+        for name, table, columns, (old_name, _old_columns) in COMPOSITE_INDEXES:
+            op.create_index(name, table, columns, unique=False)
+            op.drop_index(old_name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table, _columns, (old_name, old_columns) in COMPOSITE_INDEXES:
+        op.create_index(old_name, table, old_columns, unique=False)
+        op.drop_index(name, table_name=table)
@@ -21,9 +21,13 @@ def upgrade() -> None:
     op.add_column('journal_entries', sa.Column('tags', sa.Text(), nullable=True))
     op.create_foreign_key('fk_journal_entries_conversation_id', 'journal_entries', 'conversations', ['conversation_id'], ['id'])
     op.create_foreign_key('fk_journal_entries_message_id', 'journal_entries', 'messages', ['message_id'], ['id'])
+    op.create_index(op.f('ix_journal_entries_conversation_id'), 'journal_entries', ['conversation_id'], unique=False)
+    op.create_index(op.f('ix_journal_entries_message_id'), 'journal_entries', ['message_id'], unique=False)
 
 
 def downgrade() -> None:
+    op.drop_index(op.f('ix_journal_entries_message_id'), table_name='journal_entries')
+    op.drop_index(op.f('ix_journal_entries_conversation_id'), table_name='journal_entries')
     op.drop_constraint('fk_journal_entries_message_id', 'journal_entries', type_='foreignkey')
     op.drop_constraint('fk_journal_entries_conversation_id', 'journal_entries', type_='foreignkey')
     op.drop_column('journal_entries', 'tags')
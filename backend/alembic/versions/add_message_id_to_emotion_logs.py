@@ -17,44 +17,48 @@
 
 
 def upgrade() -> None:
-    # Add message_id column to emotion_logs
-    op.add_column('emotion_logs',
-        sa.Column('message_id', sa.Integer(), nullable=True)
-    )
-    
-    # Add foreign key constraint
-    op.create_foreign_key(
-        'fk_emotion_logs_message_id',
-        'emotion_logs', 'messages',
-        ['message_id'], ['id']
-    )
-    
-    # Create index on message_id
-    op.create_index(
-        op.f('ix_emotion_logs_message_id'),
-        'emotion_logs', ['message_id'],
-        unique=False
-    )
-    
-    # Make conversation_id NOT NULL (was nullable)
-    op.alter_column('emotion_logs', 'conversation_id',
-        existing_type=sa.Integer(),
-        nullable=False
-    )
+    # Batch the changes so SQLite rebuilds emotion_logs once instead of per
+    # operation; on PostgreSQL these remain plain ALTER TABLE statements.
+    with op.batch_alter_table('emotion_logs') as batch_op:
+        # Add message_id column to emotion_logs
+        batch_op.add_column(
+            sa.Column('message_id', sa.Integer(), nullable=True)
+        )
+
+        # Add foreign key constraint
+        batch_op.create_foreign_key(
+            'fk_emotion_logs_message_id',
+            'messages',
+            ['message_id'], ['id']
+        )
+
+        # Create index on message_id
+        batch_op.create_index(
+            op.f('ix_emotion_logs_message_id'),
+            ['message_id'],
+            unique=False
+        )
+
+        # Make conversation_id NOT NULL (was nullable)
+        batch_op.alter_column('conversation_id',
+            existing_type=sa.Integer(),
+            nullable=False
+        )
 
 
 def downgrade() -> None:
-    # Drop index
-    op.drop_index(op.f('ix_emotion_logs_message_id'), table_name='emotion_logs')
-    
-    # Drop foreign key
-    op.drop_constraint('fk_emotion_logs_message_id', 'emotion_logs', type_='foreignkey')
-    
-    # Drop column
-    op.drop_column('emotion_logs', 'message_id')
-    
-    # Revert conversation_id to nullable
-    op.alter_column('emotion_logs', 'conversation_id',
-        existing_type=sa.Integer(),
-        nullable=True
-    )
+    with op.batch_alter_table('emotion_logs') as batch_op:
+        # Drop index
+        batch_op.drop_index(op.f('ix_emotion_logs_message_id'))
+
+        # Drop foreign key
+        batch_op.drop_constraint('fk_emotion_logs_message_id', type_='foreignkey')
+
+        # Drop column
+        batch_op.drop_column('message_id')
+
+        # Revert conversation_id to nullable
+        batch_op.alter_column('conversation_id',
+            existing_type=sa.Integer(),
+            nullable=True
+        )
@@ -10,7 +10,7 @@
 3. Makes name required (nullable=False)
 4. Adds emotion column to journal_entries
 """
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 
 
@@ -19,6 +19,29 @@
 branch_labels = None
 depends_on = None
 
+# Rows per UPDATE when backfilling name from username
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def _backfill_names() -> None:
+    """Copy username into name in id-range batches, committing each batch."""
+    if context.is_offline_mode():
+        op.execute('UPDATE users SET name = username WHERE name IS NULL')
+        return
+
+    bind = op.get_bind()
+    min_id, max_id = bind.execute(sa.text('SELECT MIN(id), MAX(id) FROM users')).one()
+    if min_id is None:
+        return
+
+    stmt = sa.text(
+        'UPDATE users SET name = username '
+        'WHERE id BETWEEN :lo AND :hi AND name IS NULL'
+    )
+    with op.get_context().autocommit_block():
+        for lo in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+            op.execute(stmt.bindparams(lo=lo, hi=lo + BACKFILL_BATCH_SIZE - 1))
+
 
 def upgrade() -> None:
     # Step 1: Add name column to users table (nullable at first)
@@ -27,8 +50,9 @@ def upgrade() -> None:
         sa.Column('name', sa.String(length=255), nullable=True)
     )
     
-    # Step 2: Copy existing username data to name column
-    op.execute('UPDATE users SET name = username WHERE name IS NULL')
+    # Step 2: Copy existing username data to name column (batched so each
+    # transaction touches a bounded number of rows)
+    _backfill_names()
     
     # Step 3: Make name non-nullable
     op.alter_column('users', 'name', nullable=False)
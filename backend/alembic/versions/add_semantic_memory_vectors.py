@@ -0,0 +1,48 @@
+"""Store semantic memory embeddings as pgvector vectors."""
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+revision = "semantic_memory_pgvector"
+down_revision = "add_journal_weekly_rollups"
+branch_labels = None
+depends_on = None
+
+# Output size of BAAI/bge-small-en-v1.5 (see EmbeddingService). Hash-fallback
+# embeddings have a different size and stay JSON-only.
+EMBEDDING_DIM = 384
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        # SQLite keeps using the JSON column and Python-side similarity.
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.add_column(
+        "semantic_memories",
+        sa.Column("embedding_vector", Vector(EMBEDDING_DIM), nullable=True),
+    )
+    op.execute(
+        f"""
+        UPDATE semantic_memories
+        SET embedding_vector = embedding::text::vector
+        WHERE json_array_length(embedding) = {EMBEDDING_DIM}
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_semantic_memories_embedding_vector "
+            "ON semantic_memories USING hnsw (embedding_vector vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_semantic_memories_embedding_vector")
+    op.drop_column("semantic_memories", "embedding_vector")
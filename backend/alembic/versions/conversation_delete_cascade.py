@@ -0,0 +1,64 @@
+"""Cascade conversation deletes to dependent rows in the database."""
+
+from alembic import op
+
+
+revision = "conversation_delete_cascade"
+down_revision = "unique_emotional_profile_window"
+branch_labels = None
+depends_on = None
+
+# (table, column, constraint, referred table, ON DELETE action). Rows owned by
+# a conversation go with it; rows that merely point at a message keep
+# existing with the reference cleared.
+FOREIGN_KEYS = [
+    ("messages", "conversation_id", "messages_conversation_id_fkey", "conversations", "CASCADE"),
+    ("emotion_logs", "conversation_id", "emotion_logs_conversation_id_fkey", "conversations", "CASCADE"),
+    ("emotion_logs", "message_id", "fk_emotion_logs_message_id", "messages", "SET NULL"),
+    ("crisis_events", "conversation_id", "crisis_events_conversation_id_fkey", "conversations", "CASCADE"),
+    ("crisis_events", "message_id", "crisis_events_message_id_fkey", "messages", "SET NULL"),
+    ("journal_entries", "conversation_id", "fk_journal_entries_conversation_id", "conversations", "CASCADE"),
+    ("journal_entries", "message_id", "fk_journal_entries_message_id", "messages", "SET NULL"),
+    (
+        "conversation_context_cache", "last_message_id",
+        "conversation_context_cache_last_message_id_fkey", "messages", "SET NULL",
+    ),
+    ("semantic_memories", "conversation_id", "semantic_memories_conversation_id_fkey", "conversations", "CASCADE"),
+    ("semantic_memories", "message_id", "semantic_memories_message_id_fkey", "messages", "SET NULL"),
+]
+
+# Partitioned tables do not accept NOT VALID foreign keys
+PARTITIONED_TABLES = {"semantic_memories"}
+
+
+def _replace_foreign_keys(with_actions: bool) -> None:
+    # Each statement commits on its own so the ACCESS EXCLUSIVE lock taken by
+    # the swap is released before VALIDATE scans existing rows under a
+    # weaker one.
+    with op.get_context().autocommit_block():
+        for table, column, constraint, referred, action in FOREIGN_KEYS:
+            on_delete = f" ON DELETE {action}" if with_actions else ""
+            not_valid = "" if table in PARTITIONED_TABLES else " NOT VALID"
+            # Swap in one statement so the table is never without the constraint
+            op.execute(
+                f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}, "
+                f"ADD CONSTRAINT {constraint} FOREIGN KEY ({column}) "
+                f"REFERENCES {referred} (id){on_delete}{not_valid}"
+            )
+            if not_valid:
+                op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}")
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        # SQLite does not enforce foreign keys here; nothing to change.
+        return
+
+    _replace_foreign_keys(with_actions=True)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    _replace_foreign_keys(with_actions=False)
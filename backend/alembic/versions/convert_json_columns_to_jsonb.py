@@ -0,0 +1,61 @@
+"""Store JSON columns as JSONB on PostgreSQL."""
+
+from alembic import op
+
+
+revision = "json_columns_to_jsonb"
+down_revision = "semantic_memory_pgvector"
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs already stored as json
+JSON_COLUMNS = [
+    ("semantic_memories", "embedding"),
+    ("emotional_profiles", "emotion_distribution"),
+    ("meta_reflections", "detected_patterns"),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        # SQLite has no binary JSON type; the generic JSON column stays.
+        return
+
+    for table, column in JSON_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"
+        )
+
+    # journal_entries.tags was created as TEXT. Older rows may hold a plain
+    # comma-separated list rather than a JSON array.
+    op.execute(
+        """
+        ALTER TABLE journal_entries ALTER COLUMN tags TYPE JSONB USING
+            CASE
+                WHEN tags IS NULL OR btrim(tags) = '' THEN NULL
+                WHEN left(btrim(tags), 1) = '[' THEN tags::jsonb
+                ELSE to_jsonb(string_to_array(tags, ','))
+            END
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_meta_reflections_patterns_gin",
+            "meta_reflections",
+            ["detected_patterns"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.drop_index("ix_meta_reflections_patterns_gin", table_name="meta_reflections")
+    op.execute("ALTER TABLE journal_entries ALTER COLUMN tags TYPE TEXT USING tags::text")
+    for table, column in JSON_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSON USING {column}::json"
+        )
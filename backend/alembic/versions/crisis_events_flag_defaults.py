@@ -0,0 +1,41 @@
+"""Backfill the crisis_events flags and give them a false default in place.
+
+add_crisis_events originally created the three flags nullable with no
+server default; databases that ran that version still have them so.
+"""
+
+from alembic import op
+
+
+revision = "crisis_events_flag_defaults"
+down_revision = "journal_entries_trigram_search"
+branch_labels = None
+depends_on = None
+
+FLAG_COLUMNS = ["user_acknowledged", "escalated_to_professional", "followup_provided"]
+
+
+def upgrade() -> None:
+    for column in FLAG_COLUMNS:
+        op.execute(f"UPDATE crisis_events SET {column} = false WHERE {column} IS NULL")
+
+    if op.get_context().dialect.name != "postgresql":
+        # SQLite cannot alter columns in place; the model default covers new rows.
+        return
+
+    for column in FLAG_COLUMNS:
+        op.execute(
+            f"ALTER TABLE crisis_events ALTER COLUMN {column} SET DEFAULT false, "
+            f"ALTER COLUMN {column} SET NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    for column in FLAG_COLUMNS:
+        op.execute(
+            f"ALTER TABLE crisis_events ALTER COLUMN {column} DROP NOT NULL, "
+            f"ALTER COLUMN {column} DROP DEFAULT"
+        )
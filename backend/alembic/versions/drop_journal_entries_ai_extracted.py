@@ -0,0 +1,36 @@
+"""Contract step of the ai_extracted -> auto_extract rename.
+
+Runs once every app process writes auto_extract. Databases that ran the
+earlier single-step rename have nothing left to drop.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "drop_journal_entries_ai_extracted"
+down_revision = "crisis_events_flag_defaults"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS trg_journal_entries_sync_auto_extract ON journal_entries")
+        op.execute("DROP FUNCTION IF EXISTS journal_entries_sync_auto_extract()")
+        with op.get_context().autocommit_block():
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_journal_entries_ai_extracted")
+        op.execute("ALTER TABLE journal_entries DROP COLUMN IF EXISTS ai_extracted")
+        return
+
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("journal_entries")}
+    if "ai_extracted" in columns:
+        op.drop_index("ix_journal_entries_ai_extracted", table_name="journal_entries")
+        op.drop_column("journal_entries", "ai_extracted")
+
+
+def downgrade() -> None:
+    # Restored nullable and unsynced; downgrading rename_ai_to_auto refills
+    # it from auto_extract and puts back NOT NULL.
+    op.add_column("journal_entries", sa.Column("ai_extracted", sa.Boolean(), nullable=True))
+    op.create_index("ix_journal_entries_ai_extracted", "journal_entries", ["ai_extracted"], unique=False)
@@ -0,0 +1,33 @@
+"""Drop ix_*_id indexes that duplicate primary keys on write-heavy tables."""
+
+from alembic import op
+
+
+revision = "drop_redundant_pk_indexes"
+down_revision = "json_columns_to_jsonb"
+branch_labels = None
+depends_on = None
+
+# Each of these mirrors the table's primary key index, so every insert paid
+# for two identical B-tree updates.
+REDUNDANT_INDEXES = [
+    ("ix_messages_id", "messages"),
+    ("ix_emotion_logs_id", "emotion_logs"),
+    ("ix_journal_entries_id", "journal_entries"),
+    ("ix_crisis_events_id", "crisis_events"),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, _table in REDUNDANT_INDEXES:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    else:
+        for name, table in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, table in REDUNDANT_INDEXES:
+        op.create_index(name, table, ["id"], unique=False)
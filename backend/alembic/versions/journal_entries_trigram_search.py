@@ -0,0 +1,39 @@
+"""Trigram GIN indexes backing the journal title/content substring search."""
+
+from alembic import op
+
+
+revision = "journal_entries_trigram_search"
+down_revision = "journal_entries_user_indexes"
+branch_labels = None
+depends_on = None
+
+TRIGRAM_INDEXES = [
+    ("ix_journal_entries_title_trgm", "title"),
+    ("ix_journal_entries_content_trgm", "content"),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        # SQLite scans for ILIKE either way.
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # gin_trgm_ops serves ILIKE '%term%' directly, so search keeps its
+    # substring semantics instead of switching to word-based full-text.
+    with op.get_context().autocommit_block():
+        for name, column in TRIGRAM_INDEXES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON journal_entries USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for name, _column in TRIGRAM_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,40 @@
+"""Composite indexes for per-user journal entry pages and emotion counts."""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "journal_entries_user_indexes"
+down_revision = "conversation_delete_cascade"
+branch_labels = None
+depends_on = None
+
+SUPERSEDED_INDEX = "ix_journal_entries_user_id"
+
+COMPOSITE_INDEXES = [
+    ("ix_journal_entries_user_created", ["user_id", sa.text("created_at DESC")]),
+    ("ix_journal_entries_user_emotion_created", ["user_id", "emotion", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        # Build the composites before dropping the user_id index they cover,
+        # so the foreign key column is never left unindexed.
+        with op.get_context().autocommit_block():
+            for name, columns in COMPOSITE_INDEXES:
+                op.create_index(
+                    name, "journal_entries", columns, unique=False,
+                    postgresql_concurrently=True, if_not_exists=True,
+                )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {SUPERSEDED_INDEX}")
+    else:
+        for name, columns in COMPOSITE_INDEXES:
+            op.create_index(name, "journal_entries", columns, unique=False)
+        op.drop_index(SUPERSEDED_INDEX, table_name="journal_entries")
+
+
+def downgrade() -> None:
+    op.create_index(SUPERSEDED_INDEX, "journal_entries", ["user_id"], unique=False)
+    for name, _columns in COMPOSITE_INDEXES:
+        op.drop_index(name, table_name="journal_entries")
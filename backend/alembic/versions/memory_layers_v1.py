@@ -10,6 +10,15 @@
 depends_on = None
 
 
+def _create_secondary_index(name: str, table: str, columns: list) -> None:
+    """Create a non-unique index, CONCURRENTLY on PostgreSQL so writes are not blocked."""
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+    else:
+        op.create_index(name, table, columns, unique=False)
+
+
 def upgrade() -> None:
     op.create_table(
         "conversation_context_cache",
@@ -58,17 +67,20 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index(
+    _create_secondary_index(
         op.f("ix_semantic_memories_user_id"),
         "semantic_memories",
         ["user_id"],
-        unique=False,
     )
-    op.create_index(
+    _create_secondary_index(
         op.f("ix_semantic_memories_message_id"),
         "semantic_memories",
         ["message_id"],
-        unique=False,
+    )
+    _create_secondary_index(
+        op.f("ix_semantic_memories_conversation_id"),
+        "semantic_memories",
+        ["conversation_id"],
     )
 
     op.create_table(
@@ -96,11 +108,15 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index(
+    _create_secondary_index(
         op.f("ix_emotional_profiles_user_id"),
         "emotional_profiles",
         ["user_id"],
-        unique=False,
+    )
+    _create_secondary_index(
+        "ix_emotional_profiles_user_computed_at",
+        "emotional_profiles",
+        ["user_id", sa.text("computed_at DESC")],
     )
 
     op.create_table(
@@ -118,21 +134,26 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index(
+    _create_secondary_index(
         op.f("ix_meta_reflections_user_id"),
         "meta_reflections",
         ["user_id"],
-        unique=False,
     )
 
 
 def downgrade() -> None:
     op.drop_index(op.f("ix_meta_reflections_user_id"), table_name="meta_reflections")
     op.drop_table("meta_reflections")
+    op.drop_index(
+        "ix_emotional_profiles_user_computed_at", table_name="emotional_profiles"
+    )
     op.drop_index(
         op.f("ix_emotional_profiles_user_id"), table_name="emotional_profiles"
     )
     op.drop_table("emotional_profiles")
+    op.drop_index(
+        op.f("ix_semantic_memories_conversation_id"), table_name="semantic_memories"
+    )
     op.drop_index(op.f("ix_semantic_memories_message_id"), table_name="semantic_memories")
     op.drop_index(op.f("ix_semantic_memories_user_id"), table_name="semantic_memories")
     op.drop_table("semantic_memories")
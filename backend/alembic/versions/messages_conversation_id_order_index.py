@@ -0,0 +1,39 @@
+"""Key the messages composite index on (conversation_id, id)."""
+
+from alembic import op
+
+
+revision = "messages_conversation_id_order"
+down_revision = "hot_path_composite_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _swap_index(create: str, columns: list, drop: str) -> None:
+    """Build the replacement index before dropping the old one."""
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(create, "messages", columns, unique=False, postgresql_concurrently=True)
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {drop}")
+    else:
+        op.create_index(create, "messages", columns, unique=False)
+        op.drop_index(drop, table_name="messages")
+
+
+def upgrade() -> None:
+    # History is read by id: deltas past the last seen id and newest-N tails.
+    # role/content are deliberately not INCLUDEd; content is unbounded TEXT
+    # and would overflow the B-tree entry size limit.
+    _swap_index(
+        "ix_messages_conversation_msg_id",
+        ["conversation_id", "id"],
+        "ix_messages_conversation_created",
+    )
+
+
+def downgrade() -> None:
+    _swap_index(
+        "ix_messages_conversation_created",
+        ["conversation_id", "created_at"],
+        "ix_messages_conversation_msg_id",
+    )
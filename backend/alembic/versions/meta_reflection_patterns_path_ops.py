@@ -0,0 +1,37 @@
+"""Rebuild the detected_patterns GIN index with jsonb_path_ops."""
+
+from alembic import op
+
+
+revision = "patterns_gin_path_ops"
+down_revision = "drop_redundant_pk_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        # The GIN index only exists on PostgreSQL (see json_columns_to_jsonb).
+        return
+
+    # jsonb_path_ops only serves containment (@>) lookups, the one shape used
+    # against detected_patterns, and is markedly smaller than default jsonb_ops.
+    # Build the replacement first so the column is never left unindexed.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_meta_reflections_patterns_path_ops "
+            "ON meta_reflections USING gin (detected_patterns jsonb_path_ops)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_meta_reflections_patterns_gin")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_meta_reflections_patterns_gin "
+            "ON meta_reflections USING gin (detected_patterns)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_meta_reflections_patterns_path_ops")
@@ -0,0 +1,88 @@
+"""Hash-partition semantic_memories by user_id on PostgreSQL."""
+
+from alembic import op
+
+
+revision = "partition_semantic_memories"
+down_revision = "messages_conversation_id_order"
+branch_labels = None
+depends_on = None
+
+PARTITION_COUNT = 16
+
+# Secondary indexes recreated on the swapped-in table; on a partitioned parent
+# each one cascades to a per-partition index.
+SECONDARY_INDEXES = [
+    "CREATE INDEX ix_semantic_memories_user_importance "
+    "ON semantic_memories (user_id, importance_score DESC)",
+    "CREATE INDEX ix_semantic_memories_message_id ON semantic_memories (message_id)",
+    "CREATE INDEX ix_semantic_memories_conversation_id ON semantic_memories (conversation_id)",
+    "CREATE INDEX ix_semantic_memories_embedding_vector "
+    "ON semantic_memories USING hnsw (embedding_vector vector_cosine_ops) "
+    "WITH (m = 16, ef_construction = 64)",
+]
+
+
+def _swap_in(new_table: str) -> None:
+    """Replace semantic_memories with new_table, keeping the id sequence and FKs."""
+    # Writes block from here until the migration commits; reads continue
+    # until the old table is dropped.
+    op.execute("LOCK TABLE semantic_memories IN EXCLUSIVE MODE")
+    op.execute(f"INSERT INTO {new_table} SELECT * FROM semantic_memories")
+
+    op.execute("ALTER SEQUENCE semantic_memories_id_seq OWNED BY NONE")
+    op.execute("DROP TABLE semantic_memories")
+    op.execute(f"ALTER TABLE {new_table} RENAME TO semantic_memories")
+    op.execute(
+        f"ALTER TABLE semantic_memories RENAME CONSTRAINT {new_table}_pkey TO semantic_memories_pkey"
+    )
+    op.execute("ALTER SEQUENCE semantic_memories_id_seq OWNED BY semantic_memories.id")
+
+    op.create_foreign_key(
+        "semantic_memories_user_id_fkey", "semantic_memories", "users",
+        ["user_id"], ["id"], ondelete="CASCADE",
+    )
+    op.create_foreign_key(
+        "semantic_memories_message_id_fkey", "semantic_memories", "messages",
+        ["message_id"], ["id"],
+    )
+    op.create_foreign_key(
+        "semantic_memories_conversation_id_fkey", "semantic_memories", "conversations",
+        ["conversation_id"], ["id"],
+    )
+    for statement in SECONDARY_INDEXES:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        # SQLite has no declarative partitioning; the plain table stays.
+        return
+
+    # Every semantic memory query filters on user_id, so the planner prunes to
+    # one partition and the HNSW search walks a graph 1/16th the size.
+    # Partition keys must be part of the primary key, hence (id, user_id);
+    # id stays unique through its sequence.
+    op.execute(
+        "CREATE TABLE semantic_memories_partitioned "
+        "(LIKE semantic_memories INCLUDING DEFAULTS) PARTITION BY HASH (user_id)"
+    )
+    op.execute("ALTER TABLE semantic_memories_partitioned ADD PRIMARY KEY (id, user_id)")
+    for remainder in range(PARTITION_COUNT):
+        op.execute(
+            f"CREATE TABLE semantic_memories_p{remainder} PARTITION OF semantic_memories_partitioned "
+            f"FOR VALUES WITH (MODULUS {PARTITION_COUNT}, REMAINDER {remainder})"
+        )
+    _swap_in("semantic_memories_partitioned")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        "CREATE TABLE semantic_memories_unpartitioned "
+        "(LIKE semantic_memories INCLUDING DEFAULTS)"
+    )
+    op.execute("ALTER TABLE semantic_memories_unpartitioned ADD PRIMARY KEY (id)")
+    _swap_in("semantic_memories_unpartitioned")
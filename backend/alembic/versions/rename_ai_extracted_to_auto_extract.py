@@ -1,4 +1,4 @@
-from alembic import op
+from alembic import context, op
 import sqlalchemy as sa
 
 
@@ -7,18 +7,103 @@
 branch_labels = None
 depends_on = None
 
+# Rows per UPDATE when copying flags between the old and new columns
+BACKFILL_BATCH_SIZE = 10_000
+
+
+def _create_flag_index(name: str, column: str) -> None:
+    """Index the flag column, CONCURRENTLY on PostgreSQL so writes are not blocked."""
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(name, 'journal_entries', [column], unique=False, postgresql_concurrently=True)
+    else:
+        op.create_index(name, 'journal_entries', [column], unique=False)
+
+
+def _copy_flag(source: str, target: str) -> None:
+    """Copy one boolean column into another in id-range batches, committing each batch."""
+    if context.is_offline_mode():
+        op.execute(f'UPDATE journal_entries SET {target} = {source}')
+        return
+
+    bind = op.get_bind()
+    min_id, max_id = bind.execute(sa.text('SELECT MIN(id), MAX(id) FROM journal_entries')).one()
+    if min_id is None:
+        return
+
+    stmt = sa.text(
+        f'UPDATE journal_entries SET {target} = {source} '
+        'WHERE id BETWEEN :lo AND :hi'
+    )
+    with op.get_context().autocommit_block():
+        for lo in range(min_id, max_id + 1, BACKFILL_BATCH_SIZE):
+            op.execute(stmt.bindparams(lo=lo, hi=lo + BACKFILL_BATCH_SIZE - 1))
+
+
+# While old and new app code overlap, old code writes ai_extracted; mirror
+# those writes into auto_extract. New code never names ai_extracted (it is
+# left NULL on insert), so its writes pass through untouched.
+SYNC_FUNCTION = 'journal_entries_sync_auto_extract'
+SYNC_TRIGGER = 'trg_journal_entries_sync_auto_extract'
+
+
+def _create_sync_trigger() -> None:
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION {SYNC_FUNCTION}() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.ai_extracted IS NOT NULL THEN
+                NEW.auto_extract := NEW.ai_extracted;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        f'CREATE TRIGGER {SYNC_TRIGGER} '
+        'BEFORE INSERT OR UPDATE OF ai_extracted ON journal_entries '
+        f'FOR EACH ROW EXECUTE FUNCTION {SYNC_FUNCTION}()'
+    )
+
+
+def _drop_sync_trigger() -> None:
+    op.execute(f'DROP TRIGGER IF EXISTS {SYNC_TRIGGER} ON journal_entries')
+    op.execute(f'DROP FUNCTION IF EXISTS {SYNC_FUNCTION}()')
+
 
 def upgrade() -> None:
-    # Rename ai_extracted to auto_extract
-    op.alter_column('journal_entries', 'ai_extracted', new_column_name='auto_extract')
-    
-    # Update the index name
-    op.drop_index('ix_journal_entries_ai_extracted', table_name='journal_entries')
-    op.create_index(op.f('ix_journal_entries_auto_extract'), 'journal_entries', ['auto_extract'], unique=False)
+    # Expand step of an add-backfill-swap instead of an in-place rename, so
+    # the table is never held under an exclusive lock for the whole copy.
+    # ai_extracted is dropped later, by drop_journal_entries_ai_extracted,
+    # once no running code reads it.
+    op.add_column(
+        'journal_entries',
+        sa.Column('auto_extract', sa.Boolean(), nullable=False, server_default=sa.text('false'))
+    )
+    _create_flag_index(op.f('ix_journal_entries_auto_extract'), 'auto_extract')
+
+    if op.get_context().dialect.name == 'postgresql':
+        # Installed before the copy, so rows written during or after it are
+        # kept in step too; the copy's own UPDATE does not fire it.
+        op.alter_column(
+            'journal_entries', 'ai_extracted',
+            existing_type=sa.Boolean(), nullable=True, server_default=None,
+        )
+        _create_sync_trigger()
+
+    _copy_flag('ai_extracted', 'auto_extract')
 
 
 def downgrade() -> None:
-    # Rename auto_extract back to ai_extracted
+    if op.get_context().dialect.name == 'postgresql':
+        _drop_sync_trigger()
+
+    _copy_flag('auto_extract', 'ai_extracted')
+    op.alter_column(
+        'journal_entries', 'ai_extracted',
+        existing_type=sa.Boolean(), nullable=False, server_default=sa.text('true'),
+    )
+
     op.drop_index('ix_journal_entries_auto_extract', table_name='journal_entries')
-    op.create_index('ix_journal_entries_ai_extracted', 'journal_entries', ['ai_extracted'], unique=False)
-    op.alter_column('journal_entries', 'auto_extract', new_column_name='ai_extracted')
+    op.drop_column('journal_entries', 'auto_extract')
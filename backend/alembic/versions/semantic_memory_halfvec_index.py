@@ -0,0 +1,58 @@
+"""Rebuild the semantic memory HNSW index over half-precision vectors."""
+
+from alembic import op
+
+
+revision = "semantic_memory_halfvec_index"
+down_revision = "partition_semantic_memories"
+branch_labels = None
+depends_on = None
+
+EMBEDDING_DIM = 384
+# Matches partition_semantic_memories
+PARTITION_COUNT = 16
+
+HALF_INDEX = "ix_semantic_memories_embedding_half"
+FULL_INDEX = "ix_semantic_memories_embedding_vector"
+HNSW_PARAMS = "WITH (m = 16, ef_construction = 64)"
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    # halfvec needs pgvector >= 0.7 in the database.
+    op.execute("ALTER EXTENSION vector UPDATE")
+
+    # Index the float16 cast of embedding_vector: half the index size, so twice
+    # as many graph nodes per cached page. The column keeps full precision.
+    # A partitioned index cannot be built CONCURRENTLY, so build it per
+    # partition and attach each one to the (initially invalid) parent index.
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS {HALF_INDEX} ON ONLY semantic_memories "
+        f"USING hnsw ((embedding_vector::halfvec({EMBEDDING_DIM})) halfvec_cosine_ops) "
+        f"{HNSW_PARAMS}"
+    )
+    with op.get_context().autocommit_block():
+        for remainder in range(PARTITION_COUNT):
+            partition = f"semantic_memories_p{remainder}"
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{partition}_embedding_half "
+                f"ON {partition} "
+                f"USING hnsw ((embedding_vector::halfvec({EMBEDDING_DIM})) halfvec_cosine_ops) "
+                f"{HNSW_PARAMS}"
+            )
+            op.execute(f"ALTER INDEX {HALF_INDEX} ATTACH PARTITION ix_{partition}_embedding_half")
+
+    op.execute(f"DROP INDEX IF EXISTS {FULL_INDEX}")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        return
+
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS {FULL_INDEX} ON semantic_memories "
+        f"USING hnsw (embedding_vector vector_cosine_ops) {HNSW_PARAMS}"
+    )
+    op.execute(f"DROP INDEX IF EXISTS {HALF_INDEX}")
@@ -0,0 +1,36 @@
+"""One emotional profile per (user_id, period_days), as the upsert target."""
+
+from alembic import op
+
+
+revision = "unique_emotional_profile_window"
+down_revision = "semantic_memory_halfvec_index"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "uq_emotional_profiles_user_period"
+
+
+def upgrade() -> None:
+    # Keep the newest row of each window; duplicates could only come from
+    # concurrent recomputes racing the old update-or-add.
+    op.execute(
+        """
+        DELETE FROM emotional_profiles
+        WHERE id NOT IN (
+            SELECT MAX(id) FROM emotional_profiles GROUP BY user_id, period_days
+        )
+        """
+    )
+    if op.get_context().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME, "emotional_profiles", ["user_id", "period_days"],
+                unique=True, postgresql_concurrently=True,
+            )
+    else:
+        op.create_index(INDEX_NAME, "emotional_profiles", ["user_id", "period_days"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="emotional_profiles")
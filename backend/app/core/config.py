@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -11,6 +12,13 @@ class Settings(BaseSettings):
 
     # Database configuration
     database_url: Optional[str] = None
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    # Connections opened at startup so the first requests skip connect/TLS
+    db_pool_warm_connections: int = 5
+    # Prepared statements kept per asyncpg connection; 0 disables them, as a
+    # transaction-mode pooler (e.g. Supabase on port 6543) requires
+    db_prepared_statement_cache_size: int = 256
     secret_key: str = "dev-secret-key-change-in-production"
 
     # Supabase configuration
@@ -57,6 +65,18 @@ class Settings(BaseSettings):
     feature_goal_readiness_tuning: bool = False
     feature_async_context_refresh: bool = False
 
+    # Chat reply cache (OFF by default)
+    feature_response_cache: bool = False
+    response_cache_similarity_threshold: float = 0.92
+    response_cache_ttl_seconds: int = 3600
+    response_cache_max_history: int = 6
+    response_cache_entries_per_scope: int = 8
+    response_cache_max_scopes: int = 10000
+    response_cache_max_exact_entries: int = 10000
+
+    # Redis DSN for the post-response job queue; unset runs jobs in-process
+    task_queue_redis_url: Optional[str] = None
+
     # Semantic retrieval tuning
     memory_semantic_similarity_weight: float = 0.75
     memory_freshness_weight: float = 0.25
@@ -92,4 +112,11 @@ class Config:
         extra = "ignore"
 
 
-settings = Settings()
+
+@lru_cache()
+def get_settings() -> Settings:
+    """Build Settings once per process; .env is only read on first call."""
+    return Settings()
+
+
+settings = get_settings()
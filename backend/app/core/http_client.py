@@ -0,0 +1,21 @@
+from functools import lru_cache
+
+import httpx
+
+# One pooled client per process, so calls to the LLM, emotion, crisis and TTS
+# endpoints reuse keep-alive connections instead of a TCP/TLS handshake each.
+# Callers pass their own per-request timeout.
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=100)
+
+
+@lru_cache()
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    return httpx.AsyncClient(limits=HTTP_POOL_LIMITS)
+
+
+async def close_http_client() -> None:
+    """Close the shared client at shutdown, if it was ever created."""
+    if get_http_client.cache_info().currsize:
+        await get_http_client().aclose()
+        get_http_client.cache_clear()
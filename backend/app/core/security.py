@@ -1,43 +1,95 @@
-from passlib.context import CryptContext
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+from datetime import timedelta
+import time
 import jwt
 from app.core.config import settings
 
-# Password hashing configuration
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Password hashing configuration (argon2id, 64 MiB, 2 passes, single lane).
+# Hashes made with other parameters still verify; they encode their own.
+password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plaintext password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+# Verified against on logins for unknown emails, so a miss costs the same
+# argon2 work as a wrong password and response time does not reveal which.
+_DUMMY_PASSWORD_HASH = password_hasher.hash("serenity-dummy-password")
+
+
+def verify_dummy_password(plain_password: str) -> None:
+    """Spend one real verification's worth of work; the result is ignored."""
+    verify_password(plain_password, _DUMMY_PASSWORD_HASH)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Return True if the hash was made with different argon2 parameters."""
+    return password_hasher.check_needs_rehash(hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a plaintext password using argon2."""
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
+
+
+# HS256 signing key, encoded once instead of on every encode/decode call
+_JWT_SECRET = settings.secret_key.encode("utf-8")
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(hours=24)
+    lifetime = int(expires_delta.total_seconds()) if expires_delta else 24 * 60 * 60
     
     # Ensure subject is a string
     if "sub" in to_encode:
         to_encode["sub"] = str(to_encode["sub"])
     
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm="HS256")
+    # exp is a POSIX timestamp; build it directly instead of via datetime
+    to_encode["exp"] = int(time.time()) + lifetime
+    encoded_jwt = jwt.encode(to_encode, _JWT_SECRET, algorithm="HS256")
     return encoded_jwt
 
 
+# Verified payloads keyed by raw token, so a client's repeat requests skip the
+# HMAC check until the token expires.
+_TOKEN_CACHE_SIZE = 8192
+_token_cache: "OrderedDict[str, dict]" = OrderedDict()
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Decode and verify a JWT, reusing the payload of a recently verified token.
+
+    Raises jwt.ExpiredSignatureError / jwt.InvalidTokenError like jwt.decode.
+    """
+    payload = _token_cache.get(token)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            _token_cache.move_to_end(token)
+            return payload
+        del _token_cache[token]
+        raise jwt.ExpiredSignatureError("Signature has expired")
+
+    payload = jwt.decode(token, _JWT_SECRET, algorithms=["HS256"])
+    if isinstance(payload.get("exp"), (int, float)):
+        _token_cache[token] = payload
+        if len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
+
+
 def verify_token(token: str) -> dict:
     """Verify and decode a JWT token."""
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+        payload = decode_access_token(token)
         return payload
     except jwt.ExpiredSignatureError:
         raise ValueError("Token has expired")
@@ -0,0 +1,61 @@
+"""
+Optional Redis job queue (arq) for post-response work.
+
+With task_queue_redis_url set, jobs go to Redis and run in the worker
+process (``arq app.worker.WorkerSettings``), so they survive an API worker
+restart and do not compete with request handling for the event loop.
+Unset, or if Redis cannot be reached, they run as in-process response
+background tasks.
+"""
+
+import logging
+from typing import Any, Awaitable, Callable
+
+from fastapi import BackgroundTasks
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+
+
+async def init_task_queue() -> bool:
+    """Connect to the job queue if one is configured. Returns whether it is in use."""
+    global _pool
+    if not settings.task_queue_redis_url:
+        return False
+
+    # arq is only needed when the queue is enabled
+    from arq import create_pool
+    from arq.connections import RedisSettings
+
+    try:
+        _pool = await create_pool(RedisSettings.from_dsn(settings.task_queue_redis_url))
+    except Exception as e:
+        logger.warning(f"[TASK-QUEUE] Redis unavailable, running jobs in-process: {e}")
+        return False
+    return True
+
+
+async def close_task_queue() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def enqueue_task(
+    background_tasks: BackgroundTasks,
+    job_name: str,
+    func: Callable[..., Awaitable[Any]],
+    **kwargs: Any,
+) -> None:
+    """Queue job_name for the worker, or run func(**kwargs) after the response."""
+    if _pool is not None:
+        try:
+            await _pool.enqueue_job(job_name, **kwargs)
+            return
+        except Exception as e:
+            logger.warning(f"[TASK-QUEUE] Enqueue of {job_name} failed, running in-process: {e}")
+    background_tasks.add_task(func, **kwargs)
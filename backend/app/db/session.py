@@ -1,4 +1,5 @@
 """Database session configuration for Supabase."""
+import asyncio
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
@@ -18,6 +19,19 @@
 if "postgresql://" in async_url and "postgresql+asyncpg://" not in async_url:
     async_url = async_url.replace("postgresql://", "postgresql+asyncpg://")
 
+async_engine_options = {}
+if not async_url.startswith("sqlite"):
+    # SQLite (local runs and tests) uses a pool without size limits
+    async_engine_options["pool_size"] = settings.db_pool_size
+    async_engine_options["max_overflow"] = settings.db_max_overflow
+
+async_connect_args = {}
+if async_url.startswith("postgresql+asyncpg://"):
+    # Each query shape is parsed and planned once per connection and then
+    # reused; the journal and chat hot paths issue only a few dozen shapes.
+    async_connect_args["prepared_statement_cache_size"] = settings.db_prepared_statement_cache_size
+    async_connect_args["statement_cache_size"] = settings.db_prepared_statement_cache_size
+
 # Create async engine for application
 engine = create_async_engine(
     async_url,
@@ -25,20 +39,33 @@
     future=True,
     pool_pre_ping=True,
     pool_recycle=300,
-    pool_size=10,
-    max_overflow=20,
+    connect_args=async_connect_args,
+    **async_engine_options,
 )
 
-# Create sync engine for migrations
+# Create sync engine for migrations. Alembic only ever needs one connection,
+# so keep the pool small and LIFO so repeated runs reuse the warm connection.
 sync_url = database_url
 if "postgresql+asyncpg://" in sync_url:
     sync_url = sync_url.replace("postgresql+asyncpg://", "postgresql://")
+elif "sqlite+aiosqlite://" in sync_url:
+    sync_url = sync_url.replace("sqlite+aiosqlite://", "sqlite://")
+
+sync_engine_options = {}
+if sync_url.startswith(("postgresql://", "postgresql+psycopg2://")):
+    # psycopg2: batch executemany() UPDATE/DELETE as well as INSERT
+    sync_engine_options["executemany_mode"] = "values_plus_batch"
+if not sync_url.startswith("sqlite"):
+    sync_engine_options["pool_size"] = 1
+    sync_engine_options["max_overflow"] = 2
+    sync_engine_options["pool_use_lifo"] = True
 
 sync_engine = create_engine(
     sync_url,
     echo=settings.debug,
     pool_pre_ping=True,
     pool_recycle=300,
+    **sync_engine_options,
 )
 
 SessionLocal = sessionmaker(
@@ -59,6 +86,30 @@ async def get_db():
             await session.close()
 
 
+async def warm_pool(connections: int) -> int:
+    """
+    Open pooled connections up front so early requests skip connect/TLS.
+
+    All are checked out at once (so each is a distinct connection) and then
+    returned to the pool. Returns how many were opened.
+    """
+    connections = min(connections, settings.db_pool_size)
+    if connections <= 0:
+        return 0
+
+    results = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [conn for conn in results if not isinstance(conn, BaseException)]
+    for conn in opened:
+        await conn.close()
+
+    failures = [conn for conn in results if isinstance(conn, BaseException)]
+    if failures:
+        logger.warning(f"Pool warm-up opened {len(opened)}/{connections} connections: {failures[0]}")
+    return len(opened)
+
+
 async def check_database_health() -> bool:
     """Check if database connection is healthy."""
     try:
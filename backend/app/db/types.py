@@ -0,0 +1,6 @@
+"""Column types shared across models."""
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+# Generic JSON everywhere, stored as binary JSONB on PostgreSQL.
+PortableJSON = JSON().with_variant(JSONB(), "postgresql")
@@ -5,13 +5,17 @@
 # This software is the confidential and proprietary information of Nipun Sujesh.
 #
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.core.config import settings
 from app.core.limiter import limiter
+from app.core.http_client import close_http_client
+from app.core.task_queue import init_task_queue, close_task_queue
 from app.routers.health import router as health_router
 from app.routers.chat import router as chat_router
 from app.routers.conversations import router as conversations_router
@@ -44,36 +48,14 @@ async def dispatch(self, request, call_next):
         response = await call_next(request)
         return response
 
-app = FastAPI(
-    title="Serenity Backend",
-    version="0.2.0",
-    description="Production-grade mental health companion API",
-    docs_url="/docs",
-    redoc_url="/redoc",
-)
-
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Add proxy middleware LAST so it runs FIRST (before CORS checks)
-app.add_middleware(TrustedProxyMiddleware)
-
 # Global service instances
 emotion_service = None
 llm_service = None
 crisis_service = None
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize engines and services at startup."""
+
+async def init_services() -> None:
+    """Initialize engines and the global services; shared with the job worker."""
     global emotion_service, llm_service, crisis_service
     
     logger.info("Starting engine initialization...")
@@ -93,13 +75,60 @@ async def startup_event():
     crisis_service = CrisisService()
     logger.info(f"✓ Crisis service created (using keyword-based detection)")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize engines and services at startup."""
+    await init_services()
+
     # Warm heavy embedding model in background so first chat does not block.
     from app.services.embedding_service import embedding_service
 
     embedding_service.start_background_warmup()
     logger.info("✓ Embedding model warmup scheduled")
+
+    from app.db.session import engine, warm_pool
+
+    warmed = await warm_pool(settings.db_pool_warm_connections)
+    logger.info(f"✓ Database pool warmed ({warmed} connections)")
+
+    if await init_task_queue():
+        logger.info("✓ Task queue connected")
     
     logger.info("✓ All services initialized successfully")
+    yield
+
+    await close_task_queue()
+    await close_http_client()
+    await engine.dispose()
+
+
+app = FastAPI(
+    title="Serenity Backend",
+    version="0.2.0",
+    description="Production-grade mental health companion API",
+    docs_url="/docs",
+    redoc_url="/redoc",
+    lifespan=lifespan,
+    # Every JSON body (reply text, journal pages, analytics) is encoded by
+    # orjson in native code instead of the stdlib json module
+    default_response_class=ORJSONResponse,
+)
+
+app.state.limiter = limiter
+app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+app.add_middleware(
+    CORSMiddleware,
+    # Starlette checks `origin in allow_origins` per request; a frozenset makes it a hash lookup
+    allow_origins=frozenset(settings.cors_origins),
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Add proxy middleware LAST so it runs FIRST (before CORS checks)
+app.add_middleware(TrustedProxyMiddleware)
 
 app.include_router(health_router)
 app.include_router(auth_router)
@@ -1,28 +1,51 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, ForeignKey, Boolean, Index, text
 from sqlalchemy.sql import func
 from app.db.base import Base
 
+# crisis_service_new.CrisisService records every escalation as 'crisis'
+ACTIVE_HIGH_SEVERITY_PREDICATE = (
+    "severity = 'crisis' AND user_acknowledged IS NOT TRUE"
+)
+
 
 class CrisisEvent(Base):
     """Crisis intervention log."""
     __tablename__ = "crisis_events"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=True, index=True)
-    message_id = Column(Integer, ForeignKey("messages.id"), nullable=True, index=True)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=True, index=True)
+    message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True, index=True)
     
-    severity = Column(String(20), nullable=False, index=True)
+    severity = Column(String(20), nullable=False)
     confidence = Column(Float, nullable=True)
     keywords_detected = Column(Text, nullable=True)
     response_sent = Column(Text, nullable=True)
     pattern_detected = Column(String(255), nullable=True)
     
-    user_acknowledged = Column(Boolean, default=False)
-    escalated_to_professional = Column(Boolean, default=False)
-    followup_provided = Column(Boolean, default=False)
+    user_acknowledged = Column(Boolean, default=False, server_default=text("false"), nullable=False)
+    escalated_to_professional = Column(Boolean, default=False, server_default=text("false"), nullable=False)
+    followup_provided = Column(Boolean, default=False, server_default=text("false"), nullable=False)
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     notes = Column(Text, nullable=True)
+
+    __table_args__ = (
+        # Covers per-user trend queries (user_id = ? AND created_at >= ?).
+        Index(
+            "ix_crisis_events_user_created",
+            user_id,
+            created_at.desc(),
+            postgresql_include=["severity", "confidence"],
+        ),
+        # Unacknowledged crisis events only.
+        Index(
+            "ix_crisis_events_active_high",
+            user_id,
+            created_at.desc(),
+            postgresql_where=text(ACTIVE_HIGH_SEVERITY_PREDICATE),
+            sqlite_where=text(ACTIVE_HIGH_SEVERITY_PREDICATE),
+        ),
+    )
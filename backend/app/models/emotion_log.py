@@ -7,10 +7,10 @@ class EmotionLog(Base):
     """Emotion tracking record."""
     __tablename__ = "emotion_logs"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=True, index=True)
-    message_id = Column(Integer, ForeignKey("messages.id"), nullable=True, index=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=True, index=True)
+    message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True, index=True)
     
     primary_emotion = Column(String(50), nullable=False)
     confidence = Column(Float, default=0.0)
@@ -1,22 +1,23 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Boolean, Float, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
+from app.db.types import PortableJSON
 
 
 class JournalEntry(Base):
     """User journal entry."""
     __tablename__ = "journal_entries"
     
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=True, index=True)
-    message_id = Column(Integer, ForeignKey("messages.id"), nullable=True, index=True)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=True, index=True)
+    message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True, index=True)
     
     title = Column(String(255), nullable=True)
     content = Column(Text, nullable=False)
     emotion = Column(String(50), nullable=True, default="neutral")
     mood = Column(String(50), nullable=True)
-    tags = Column(JSON, nullable=True, default=[])
+    tags = Column(PortableJSON, nullable=True, default=[])
     
     extracted_insights = Column(Text, nullable=True)
     
@@ -29,6 +30,30 @@ class JournalEntry(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Newest-first entry pages for a user, without a sort step; the
+        # user_id prefix also serves the foreign key lookups.
+        Index("ix_journal_entries_user_created", user_id, created_at.desc()),
+        # Per-emotion counts and emotion-filtered pages for a user.
+        Index("ix_journal_entries_user_emotion_created", user_id, emotion, created_at),
+        # Substring (ILIKE '%term%') search over title and content.
+        Index(
+            "ix_journal_entries_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_journal_entries_content_trgm",
+            content,
+            postgresql_using="gin",
+            postgresql_ops={"content": "gin_trgm_ops"},
+        ),
+    )
+    # Fetch created_at/updated_at with RETURNING on INSERT and UPDATE, so
+    # the journal endpoints can answer without a refresh query.
+    __mapper_args__ = {"eager_defaults": True}
+
 
 class JournalWeeklyRollup(Base):
     """Weekly merged signal summaries used for delta-first auto extraction."""
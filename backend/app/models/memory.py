@@ -6,10 +6,16 @@
     DateTime,
     Float,
     ForeignKey,
+    Index,
     JSON,
 )
 from sqlalchemy.sql import func
+from pgvector.sqlalchemy import Vector
 from app.db.base import Base
+from app.db.types import PortableJSON
+
+# Dimension of the primary embedding model (BAAI/bge-small-en-v1.5).
+SEMANTIC_EMBEDDING_DIM = 384
 
 
 class ConversationContextCache(Base):
@@ -21,10 +27,10 @@ class ConversationContextCache(Base):
     __tablename__ = "conversation_context_cache"
 
     conversation_id = Column(
-        Integer, ForeignKey("conversations.id"), primary_key=True, index=True
+        Integer, ForeignKey("conversations.id", ondelete="CASCADE"), primary_key=True, index=True
     )
     summary = Column(Text, nullable=True)
-    last_message_id = Column(Integer, ForeignKey("messages.id"), nullable=True)
+    last_message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True)
     message_count = Column(Integer, default=0, nullable=False)
     updated_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
@@ -40,17 +46,30 @@ class SemanticMemory(Base):
 
     __tablename__ = "semantic_memories"
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
-    message_id = Column(Integer, ForeignKey("messages.id"), nullable=True, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=True)
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True, index=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=True, index=True)
     content = Column(Text, nullable=False)
-    embedding = Column(JSON, nullable=False)
+    embedding = Column(PortableJSON, nullable=False)
+    # Populated on PostgreSQL when the embedding has the model's dimension;
+    # backs the HNSW nearest-neighbour lookup in MemoryService.
+    embedding_vector = Column(
+        Vector(SEMANTIC_EMBEDDING_DIM).with_variant(JSON(), "sqlite"), nullable=True
+    )
     emotion_label = Column(String(32), nullable=True)
     importance_score = Column(Float, default=0.0)
     source = Column(String(32), default="chat", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # On PostgreSQL the table is hash-partitioned on user_id (see the
+    # partition_semantic_memories migration) with primary key (id, user_id);
+    # id alone stays unique through its sequence, so the ORM keys on it.
+    __table_args__ = (
+        # Top-N memories by importance for a user, without a sort step.
+        Index("ix_semantic_memories_user_importance", user_id, importance_score.desc()),
+    )
+
 
 class EmotionalProfile(Base):
     """
@@ -72,12 +91,19 @@ class EmotionalProfile(Base):
     resilience_score = Column(Float, default=0.0)
     volatility_index = Column(Float, default=0.0)
     log_count = Column(Integer, default=0)
-    emotion_distribution = Column(JSON, nullable=True)
+    emotion_distribution = Column(PortableJSON, nullable=True)
     trend = Column(String(32), nullable=True)
     computed_at = Column(
         DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    __table_args__ = (
+        # Backs the "latest profile for user" lookups in MemoryService.
+        Index("ix_emotional_profiles_user_computed_at", user_id, computed_at.desc()),
+        # Conflict target for the profile upsert: one row per user and window.
+        Index("uq_emotional_profiles_user_period", user_id, period_days, unique=True),
+    )
+
 
 class MetaReflection(Base):
     """
@@ -92,5 +118,14 @@ class MetaReflection(Base):
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
     reflection_summary = Column(Text, nullable=False)
-    detected_patterns = Column(JSON, nullable=True)
+    detected_patterns = Column(PortableJSON, nullable=True)
     generated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index(
+            "ix_meta_reflections_patterns_path_ops",
+            detected_patterns,
+            postgresql_using="gin",
+            postgresql_ops={"detected_patterns": "jsonb_path_ops"},
+        ),
+    )
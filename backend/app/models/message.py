@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 import enum
@@ -14,8 +14,15 @@ class Message(Base):
     """Individual chat message."""
     __tablename__ = "messages"
     
-    id = Column(Integer, primary_key=True, index=True)
-    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id", ondelete="CASCADE"), nullable=False)
     role = Column(Enum(MessageRole), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Conversation history is always read in id (insertion) order, either
+        # as a delta past the last seen id or as the newest N; the
+        # conversation_id prefix also serves the foreign key lookups.
+        Index("ix_messages_conversation_msg_id", conversation_id, id),
+    )
@@ -1,22 +1,62 @@
 import logging
+import time
+from collections import OrderedDict
 from fastapi import APIRouter, HTTPException, status, Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, insert, func, exists
+from sqlalchemy.orm import make_transient_to_detached
 from app.db.session import get_db
 from app.schemas.auth import LoginRequest, SignupRequest, UserResponse, LoginResponse, SignupResponse
-from app.core.security import verify_password, get_password_hash, create_access_token, verify_token
+from app.core.security import verify_password, verify_dummy_password, password_needs_rehash, get_password_hash, create_access_token, verify_token, decode_access_token
 from app.models.user import User
 from app.models.conversation import Conversation
 from app.models.journal_entry import JournalEntry
 from datetime import datetime
 import jwt
-from app.core.config import settings
-from typing import Optional
+from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
+# Column snapshots of recently authenticated users, so most requests skip the
+# users lookup. Kept short-lived and dropped on profile update/delete.
+_USER_CACHE_TTL_SECONDS = 30
+_USER_CACHE_SIZE = 5000
+_user_cache: "OrderedDict[int, Tuple[float, dict]]" = OrderedDict()
+
+
+def _cache_user(user: User) -> None:
+    snapshot = {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+    _user_cache[user.id] = (time.monotonic() + _USER_CACHE_TTL_SECONDS, snapshot)
+    _user_cache.move_to_end(user.id)
+    if len(_user_cache) > _USER_CACHE_SIZE:
+        _user_cache.popitem(last=False)
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Forget the cached snapshot for a user whose row has changed."""
+    _user_cache.pop(user_id, None)
+
+
+async def _load_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Return the user attached to db, from the snapshot cache when fresh."""
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        expires_at, snapshot = cached
+        if expires_at > time.monotonic():
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            # load=False attaches the snapshot as persistent without a SELECT
+            return await db.merge(user, load=False)
+        invalidate_cached_user(user_id)
+
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        _cache_user(user)
+    return user
+
 
 async def get_current_user(db: AsyncSession = Depends(get_db), authorization: Optional[str] = Header(None)) -> User:
     """Retrieve current user from JWT token."""
@@ -37,7 +77,7 @@ async def get_current_user(db: AsyncSession = Depends(get_db), authorization: Op
         raise credentials_exception
 
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+        payload = decode_access_token(token)
         user_id_str: str = payload.get("sub")
         user_id: int = int(user_id_str)  # Ensure integer format
         if user_id is None:
@@ -47,9 +87,7 @@ async def get_current_user(db: AsyncSession = Depends(get_db), authorization: Op
     except Exception:
         raise credentials_exception
 
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    user = await _load_user(db, user_id)
 
     if user is None:
         raise credentials_exception
@@ -70,7 +108,7 @@ async def get_current_user_ws(token: str) -> Optional[User]:
     try:
         from app.db.session import SessionLocal
 
-        payload = jwt.decode(token, settings.secret_key, algorithms=["HS256"])
+        payload = decode_access_token(token)
         user_id_str: str = payload.get("sub")
         user_id: int = int(user_id_str)
 
@@ -95,11 +133,19 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
     result = await db.execute(stmt)
     user = result.scalar_one_or_none()
     
+    if user is None:
+        verify_dummy_password(request.password)
     if not user or not verify_password(request.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
+
+    # Upgrade hashes created with the old passlib parameters on first login
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(request.password)
+        await db.commit()
+        invalidate_cached_user(user.id)
     
     access_token = create_access_token(data={"sub": user.id})
     
@@ -118,11 +164,9 @@ async def login(request: LoginRequest, db: AsyncSession = Depends(get_db)):
 @router.post("/signup/", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def signup(request: SignupRequest, db: AsyncSession = Depends(get_db)):
     """Register new user."""
-    stmt = select(User).where(User.email == request.email)
-    result = await db.execute(stmt)
-    existing_user = result.scalar_one_or_none()
+    email_taken = await db.scalar(select(exists().where(User.email == request.email)))
     
-    if existing_user:
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -130,16 +174,19 @@ async def signup(request: SignupRequest, db: AsyncSession = Depends(get_db)):
     
     hashed_password = get_password_hash(request.password)
     
-    user = User(
-        name=request.name,
-        email=request.email,
-        hashed_password=hashed_password,
-        username=request.name  # Using name as username
+    # RETURNING hands back the server-generated id and created_at, so no
+    # refresh() SELECT is needed after the commit.
+    user = await db.scalar(
+        insert(User)
+        .values(
+            name=request.name,
+            email=request.email,
+            hashed_password=hashed_password,
+            username=request.name  # Using name as username
+        )
+        .returning(User)
     )
-    
-    db.add(user)
     await db.commit()
-    await db.refresh(user)
     
     access_token = create_access_token(data={"sub": user.id})
     
@@ -158,13 +205,18 @@ async def signup(request: SignupRequest, db: AsyncSession = Depends(get_db)):
 @router.get("/profile/", response_model=dict)
 async def get_profile(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     """Retrieve user profile."""
-    conv_stmt = select(Conversation).where(Conversation.user_id == current_user.id)
-    conv_result = await db.execute(conv_stmt)
-    conversation_count = len(conv_result.scalars().all())
-    
-    journal_stmt = select(JournalEntry).where(JournalEntry.user_id == current_user.id)
-    journal_result = await db.execute(journal_stmt)
-    journal_count = len(journal_result.scalars().all())
+    # Both counts in one round-trip, answered from the user_id indexes
+    counts_stmt = select(
+        select(func.count())
+        .select_from(Conversation)
+        .where(Conversation.user_id == current_user.id)
+        .scalar_subquery(),
+        select(func.count())
+        .select_from(JournalEntry)
+        .where(JournalEntry.user_id == current_user.id)
+        .scalar_subquery(),
+    )
+    conversation_count, journal_count = (await db.execute(counts_stmt)).one()
     
     return {
         "user": {
@@ -193,7 +245,7 @@ async def update_profile(
         current_user.email = request["email"]
     
     await db.commit()
-    await db.refresh(current_user)
+    invalidate_cached_user(current_user.id)
     
     return {
         "user": {
@@ -210,4 +262,5 @@ async def delete_account(current_user: User = Depends(get_current_user), db: Asy
     """Delete account."""
     await db.delete(current_user)
     await db.commit()
+    invalidate_cached_user(current_user.id)
     return None
@@ -1,17 +1,21 @@
 import logging
 import asyncio
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.chat import ChatRequest, ChatResponse
-from app.services.conversation_service import ConversationService
+from app.services.conversation_service import ConversationService, forget_conversation_owner
 from app.services.journal_service import JournalService
-from app.services.emotion_analytics_service import EmotionAnalyticsService
-from app.services.context_manager import ContextManager
+from app.services.emotion_analytics_service import EmotionAnalyticsService, forget_user_insights
+from app.services.context_manager import ContextManager, forget_conversation
 from app.services.memory_service import memory_service
 from app.services.context_refresh_service import context_refresh_service
+from app.services.embedding_service import embedding_service
+from app.services.response_cache import response_cache
 from app.core.config import settings
-from app.db.session import get_db
+from app.core.task_queue import enqueue_task
+from app.db.session import get_db, SessionLocal
 from app.routers.auth import get_current_user
 from app.models.user import User
 import app.main as main_app
@@ -26,12 +30,38 @@
 emotion_analytics_service = EmotionAnalyticsService()
 context_manager = ContextManager()
 
+# Bytes of reply text per SSE frame when replaying an already-complete reply
+SSE_CHUNK_SIZE = 64
+
+
+def sse_frame(body: bytes) -> bytes:
+    """Wrap encoded text in one SSE frame.
+
+    Each line gets its own ``data:`` field so embedded newlines cannot cut
+    the rest of the text out of the frame.
+    """
+    return b"data: " + body.replace(b"\n", b"\ndata: ") + b"\n\n"
+
+
+def sse_chunks(text: str):
+    """Yield a complete reply as pre-encoded SSE frames of ~SSE_CHUNK_SIZE bytes.
+
+    The reply is encoded once and sliced on UTF-8 character boundaries.
+    """
+    body = text.encode("utf-8")
+    start = 0
+    while start < len(body):
+        end = min(start + SSE_CHUNK_SIZE, len(body))
+        # Back off continuation bytes (0b10xxxxxx) so no character is split.
+        while end < len(body) and body[end] & 0xC0 == 0x80:
+            end -= 1
+        yield sse_frame(body[start:end])
+        start = end
+
 
 # Background task for generating conversation title
 async def generate_title_async(conversation_id: int, user_message: str):
     """Generate title from initial message in background."""
-    from app.db.session import SessionLocal
-    
     logger.info(f"[TITLE] ✓ Starting title generation for conversation {conversation_id}")
     
     # Small delay to ensure conversation is created
@@ -62,37 +92,130 @@ async def generate_title_async(conversation_id: int, user_message: str):
             logger.error(f"[TITLE] ✗ BACKGROUND TASK EXCEPTION for conversation {conversation_id}: {str(e)}", exc_info=True)
 
 
+async def load_user_insight(user_id: int):
+    """Fetch the 7-day emotional insight on its own session so it can overlap other DB work."""
+    async with SessionLocal() as insight_db:
+        return await emotion_analytics_service.generate_user_insights(
+            db=insight_db, user_id=user_id, days=7
+        )
+
+
+async def save_user_message(db: AsyncSession, conversation_id: int, content: str) -> int:
+    """Save the user's message, answering 404 if the conversation is gone.
+
+    Ownership may have come from the cache, so the conversation can have been
+    deleted by another worker since; save_message's foreign key catches that.
+    """
+    try:
+        return await conversation_service.save_message(db, conversation_id, "user", content)
+    except ValueError:
+        forget_conversation_owner(conversation_id)
+        raise HTTPException(status_code=404, detail=f"Conversation {conversation_id} not found")
+
+
+async def save_assistant_placeholder(conversation_id: int) -> Optional[int]:
+    """Insert an empty assistant row for a streamed reply; runs while the LLM decodes."""
+    async with SessionLocal() as save_db:
+        try:
+            message_id = await conversation_service.save_message(
+                save_db, conversation_id, "assistant", ""
+            )
+            await save_db.commit()
+            return message_id
+        except Exception as e:
+            logger.error(f"Failed to create assistant placeholder: {e}")
+            return None
+
+
+async def finish_assistant_message(
+    placeholder: "asyncio.Task[Optional[int]]", conversation_id: int, content: str
+) -> int:
+    """Write the streamed reply into its placeholder row with a single UPDATE.
+
+    Also runs when the client disconnects mid-stream, so a partial reply is
+    kept and a reply with no text at all removes the row.
+    """
+    message_id = await placeholder
+    kept = False
+    async with SessionLocal() as save_db:
+        try:
+            if message_id is None:
+                if content:
+                    message_id = await conversation_service.save_message(
+                        save_db, conversation_id, "assistant", content
+                    )
+                    kept = True
+            else:
+                kept = await conversation_service.finalize_message(save_db, message_id, content)
+            await save_db.commit()
+        except Exception as e:
+            logger.error(f"Failed to save streamed assistant message: {e}")
+
+    # A history read during the stream may have cached the empty placeholder
+    forget_conversation(conversation_id)
+    return message_id if kept else 0
+
+
+async def log_crisis_emotion_async(
+    user_id: int, conversation_id: int, message_id: int, user_message: str
+):
+    """Detect and log the emotion of a crisis message after the crisis reply is sent."""
+    try:
+        emotion = await main_app.emotion_service.detect_emotion(user_message)
+    except Exception as e:
+        logger.warning(f"Failed to log emotion in crisis response: {str(e)}")
+        return
+
+    async with SessionLocal() as db:
+        emotion_log_id = await main_app.emotion_service.log_emotion(
+            db=db, user_id=user_id, conversation_id=conversation_id,
+            message_id=message_id, label=emotion["label"],
+            confidence=emotion["confidence"]
+        )
+        if emotion_log_id is not None:
+            await db.commit()
+
+
+def summarize_recent_turns(history: list) -> str:
+    """Short summary of the last three turns for the journal gate."""
+    return " ".join(m["content"][:100] for m in history[-3:] if m.get("content"))
+
+
 # Background task for post-chat processing
 async def post_process_chat_async(
     user_id: int,
     conversation_id: int,
     message_id: int,
     history: list,
+    recent_summary: str,
     user_message: str,
-    emotion_label: str
+    emotion_label: str,
+    emotion_confidence: Optional[float] = None
 ):
     """
     Non-critical post-processing tasks run in background after response is sent.
     This prevents blocking the chat endpoint.
+
+    emotion_confidence is None when emotion detection failed, in which case
+    no emotion log is written.
     """
-    from app.db.session import SessionLocal
-    
     async with SessionLocal() as db:
         try:
-            # Emotion Analytics (non-blocking)
-            try:
-                await emotion_analytics_service.generate_user_insights(
-                    db=db, user_id=user_id, days=7
-                )
-                logger.info(f"[ANALYTICS] Processed for user={user_id}")
-            except Exception as e:
-                logger.warning(f"Analytics failed (non-blocking): {str(e)}")
+            # Emotion Log (non-blocking) - only read by later turns' analytics
+            if emotion_confidence is not None:
+                try:
+                    await main_app.emotion_service.log_emotion(
+                        db=db, user_id=user_id, conversation_id=conversation_id,
+                        message_id=message_id, label=emotion_label,
+                        confidence=emotion_confidence,
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to log emotion: {str(e)}")
             
             # Journal Extraction (non-blocking)
             try:
-                summary = " ".join([m.get("content", "")[:100] for m in history[-3:]])
                 should_extract = await main_app.llm_service.should_create_journal_entry(
-                    conversation_summary=summary,
+                    conversation_summary=recent_summary,
                     user_message=user_message,
                 )
 
@@ -181,26 +304,27 @@ async def chat_endpoint(
     )
     
     if crisis_assessment["requires_escalation"]:
-        user_message_id = await conversation_service.save_message(
-            db, conversation_id, "user", body.message
-        )
+        user_message_id = await save_user_message(db, conversation_id, body.message)
+        # Both rows go out in one flush; a savepoint keeps a failure to record
+        # them from losing the user message or blocking the crisis reply
         try:
-            # Override emotion logging to strictly record this as a "crisis"
-            await main_app.emotion_service.log_emotion(
-                db=db, user_id=current_user.id, conversation_id=conversation_id,
-                message_id=user_message_id, label="crisis",
-                confidence=1.0
-            )
-        except Exception as e:
-            logger.warning(f"Failed to log emotion in crisis response: {str(e)}")
-        try:
-            await main_app.crisis_service.log_crisis_event(
-                db=db, user_id=current_user.id, conversation_id=conversation_id,
-                message_id=user_message_id, assessment=crisis_assessment
-            )
+            async with db.begin_nested():
+                db.add_all([
+                    # Override emotion logging to strictly record this as a "crisis"
+                    main_app.emotion_service.build_emotion_log(
+                        user_id=current_user.id, conversation_id=conversation_id,
+                        message_id=user_message_id, label="crisis", confidence=1.0
+                    ),
+                    main_app.crisis_service.build_crisis_event(
+                        user_id=current_user.id, conversation_id=conversation_id,
+                        message_id=user_message_id, assessment=crisis_assessment
+                    ),
+                ])
         except Exception as e:
             logger.warning(f"Failed to log crisis event: {str(e)}")
         await db.commit()
+        # Cached insights would hide the event from high_risk / crisis_count_48h
+        forget_user_insights(current_user.id)
         return ChatResponse(
             reply=crisis_assessment["response"],
             conversation_id=conversation_id,
@@ -210,75 +334,102 @@ async def chat_endpoint(
             resources=crisis_assessment["resources"]
         )
     
+    # Emotion detection needs neither the history nor the saved row; start it
+    # now so it overlaps the history read and user message save
+    emotion_task = asyncio.create_task(main_app.emotion_service.detect_emotion(body.message))
+
     # CRITICAL PATH: Get conversation history
     history = await context_manager.get_optimized_history(db, conversation_id)
     
-    # CRITICAL PATH: Save user message
-    user_message_id = await conversation_service.save_message(
-        db, conversation_id, "user", body.message
-    )
-    await db.commit()
-    
-    # Generate conversation title in background if new conversation
-    if body.conversation_id is None:
-        background_tasks.add_task(
-            generate_title_async,
-            conversation_id=conversation_id,
-            user_message=body.message
+    # CRITICAL PATH: Save user message. save_message only flushes, so the
+    # id is known now; the row commits together with the assistant reply.
+    try:
+        user_message_id = await save_user_message(db, conversation_id, body.message)
+    except HTTPException:
+        emotion_task.cancel()
+        raise
+
+    # Only trigger crisis mode for actual crisis keywords, not just negative emotions
+    actual_crisis = await main_app.emotion_service.detect_crisis_signals(body.message)
+
+    # A literal repeat at the same point of a short conversation reuses the
+    # earlier reply and emotion outright; a near-identical message reuses the
+    # reply, skipping memory retrieval and the LLM call
+    cached_turn = None
+    cached_reply = None
+    exact_key = cache_scope = query_embedding = None
+    if response_cache.is_eligible(history, actual_crisis):
+        exact_key = response_cache.exact_key(
+            current_user.id, history, body.message, type(main_app.emotion_service.engine).__name__
         )
-    
-    # Run emotion detection and memory bundle concurrently — they don't depend on each other
-    emotion_result, memory_bundle = await asyncio.gather(
-        main_app.emotion_service.detect_emotion(body.message),
-        memory_service.build_memory_bundle(
-            db=db,
-            user_id=current_user.id,
-            conversation_id=conversation_id,
-            history=history,
-            user_message=body.message,
-        ),
-        return_exceptions=True,
-    )
+        cached_turn = response_cache.get(exact_key)
+        if cached_turn is not None:
+            cached_reply = cached_turn.reply
+        else:
+            cache_scope = response_cache.scope_for(current_user.id, history)
+            query_embedding = await embedding_service.embed(body.message)
+            cached_reply = response_cache.lookup(cache_scope, query_embedding)
+
+    if cached_turn is not None:
+        emotion_task.cancel()
+        emotion_result, memory_bundle, insight = dict(cached_turn.emotion), None, None
+    else:
+        # Run emotion detection, memory bundle and insights concurrently — they don't
+        # depend on each other (insights use their own session)
+        pending = [emotion_task]
+        if cached_reply is None:
+            pending += [
+                memory_service.build_memory_bundle(
+                    db=db,
+                    user_id=current_user.id,
+                    conversation_id=conversation_id,
+                    history=history,
+                    user_message=body.message,
+                ),
+                load_user_insight(current_user.id),
+            ]
+        emotion_result, *context_results = await asyncio.gather(*pending, return_exceptions=True)
+        memory_bundle, insight = context_results or (None, None)
 
     emotion = {"label": "neutral", "confidence": 0.5}
+    # Confidence of a successful detection; the emotion log is written in post-processing
+    logged_confidence = None
     if isinstance(emotion_result, Exception):
         logger.warning(f"Emotion detection failed: {emotion_result}")
     else:
         emotion = emotion_result
-        try:
-            await main_app.emotion_service.log_emotion(
-                db=db, user_id=current_user.id, conversation_id=conversation_id,
-                message_id=user_message_id, label=emotion["label"],
-                confidence=emotion["confidence"],
-            )
-        except Exception as e:
-            logger.warning(f"Failed to log emotion: {str(e)}")
+        logged_confidence = emotion["confidence"]
 
     if isinstance(memory_bundle, Exception):
         logger.warning(f"Memory bundle failed: {memory_bundle}")
         memory_bundle = None
 
-    logger.info(f"[DEBUG] History: {len(history)} messages, user message: {body.message[:50]}...")
+    if isinstance(insight, Exception):
+        logger.warning(f"Analytics query failed: {insight}")
+        insight = None
 
-    # Get insight for response generation (lightweight query)
-    insight = None
-    try:
-        insight = await emotion_analytics_service.generate_user_insights(
-            db=db, user_id=current_user.id, days=7
-        )
-    except Exception as e:
-        logger.warning(f"Analytics query failed: {str(e)}")
+    logger.info(f"[DEBUG] History: {len(history)} messages, user message: {body.message[:50]}...")
     
     # CRITICAL PATH: Generate LLM response
-    # Only trigger crisis mode for actual crisis keywords, not just negative emotions
-    actual_crisis = await main_app.emotion_service.detect_crisis_signals(body.message)
-    reply = await main_app.llm_service.get_response(
-        user_message=body.message,
-        conversation_history=history,
-        emotional_insight=insight,
-        crisis_detected=actual_crisis,
-        memory_bundle=memory_bundle,
-    )
+    if cached_reply is not None:
+        reply = cached_reply
+    else:
+        reply = await main_app.llm_service.get_response(
+            user_message=body.message,
+            conversation_history=history,
+            emotional_insight=insight,
+            crisis_detected=actual_crisis,
+            memory_bundle=memory_bundle,
+        )
+
+    # get_response swallows engine errors; never cache the canned fallback
+    if cached_turn is None and exact_key is not None and (
+        reply != main_app.llm_service._get_fallback_response(body.message)
+    ):
+        if cache_scope is not None and cached_reply is None:
+            response_cache.store(cache_scope, query_embedding, reply)
+        if logged_confidence is not None:
+            response_cache.set(exact_key, reply, emotion)
     
     logger.info(
         f"[CHAT] user={current_user.id} | "
@@ -286,27 +437,40 @@ async def chat_endpoint(
         f"response_len={len(reply)}"
     )
     
-    # CRITICAL PATH: Store assistant response
-    assistant_message_id = await conversation_service.save_message(
-        db, conversation_id, "assistant", reply
-    )
+    # CRITICAL PATH: Store assistant response; one commit covers the turn.
+    # save_message above already checked the conversation, so the reply is
+    # only staged and its INSERT rides on the commit's flush.
+    conversation_service.add_message(db, conversation_id, "assistant", reply)
     await db.commit()
     
-    # NON-CRITICAL: Schedule background processing (runs after response sent)
-    background_tasks.add_task(
-        post_process_chat_async,
+    # NON-CRITICAL: Schedule background processing (runs after response sent,
+    # or in the job worker). Queued only now that the turn is committed.
+    if body.conversation_id is None:
+        await enqueue_task(
+            background_tasks, "generate_title", generate_title_async,
+            conversation_id=conversation_id,
+            user_message=body.message
+        )
+    await enqueue_task(
+        background_tasks, "post_process_chat", post_process_chat_async,
         user_id=current_user.id,
         conversation_id=conversation_id,
         message_id=user_message_id,
         history=history,
+        recent_summary=summarize_recent_turns(history),
         user_message=body.message,
-        emotion_label=emotion.get("label", "neutral")
+        emotion_label=emotion.get("label", "neutral"),
+        emotion_confidence=logged_confidence,
     )
     background_tasks.add_task(context_refresh_service.maybe_prewarm, current_user.id)
 
     logger.info("[CTX-METRICS] %s", context_refresh_service.metrics())
+    if exact_key is not None:
+        logger.info("[RESPONSE-CACHE] %s", response_cache.metrics())
     
-    return ChatResponse(
+    # Every field is produced server-side, and FastAPI validates the body
+    # against response_model anyway; skip the first, redundant pass
+    return ChatResponse.model_construct(
         reply=reply,
         conversation_id=conversation_id,
         message_id=user_message_id,
@@ -348,54 +512,54 @@ async def chat_stream_endpoint(
     )
     
     if crisis_assessment["requires_escalation"]:
-        user_message_id = await conversation_service.save_message(
-            db, conversation_id, "user", body.message
-        )
+        user_message_id = await save_user_message(db, conversation_id, body.message)
+        # The crisis event is recorded before replying; the emotion log can
+        # wait. A failure to record it must not hold back the crisis frames.
         try:
-            emotion = await main_app.emotion_service.detect_emotion(body.message)
-            await main_app.emotion_service.log_emotion(
-                db=db, user_id=current_user.id, conversation_id=conversation_id,
-                message_id=user_message_id, label=emotion["label"],
-                confidence=emotion["confidence"]
-            )
-        except Exception as e:
-            logger.warning(f"Failed to log emotion in crisis response: {str(e)}")
-        try:
-            await main_app.crisis_service.log_crisis_event(
-                db=db, user_id=current_user.id, conversation_id=conversation_id,
-                message_id=user_message_id, assessment=crisis_assessment
-            )
+            async with db.begin_nested():
+                db.add(main_app.crisis_service.build_crisis_event(
+                    user_id=current_user.id, conversation_id=conversation_id,
+                    message_id=user_message_id, assessment=crisis_assessment
+                ))
         except Exception as e:
             logger.warning(f"Failed to log crisis event: {str(e)}")
         await db.commit()
+        # Cached insights would hide the event from high_risk / crisis_count_48h
+        forget_user_insights(current_user.id)
+        background_tasks.add_task(
+            log_crisis_emotion_async,
+            user_id=current_user.id,
+            conversation_id=conversation_id,
+            message_id=user_message_id,
+            user_message=body.message,
+        )
         
         async def crisis_generator():
-            response_text = crisis_assessment["response"]
-            for char in response_text:
-                yield f"data: {char}\n\n"
-                await asyncio.sleep(0.01)
+            for frame in sse_chunks(crisis_assessment["response"]):
+                yield frame
             yield f"data: __CRISIS__{crisis_assessment['severity']}__{len(crisis_assessment.get('resources', []))}\n\n"
         
-        return StreamingResponse(crisis_generator(), media_type="text/event-stream")
+        return StreamingResponse(
+            crisis_generator(), media_type="text/event-stream", background=background_tasks
+        )
     
     history = await context_manager.get_optimized_history(
         db, conversation_id
     )
-    user_message_id = await conversation_service.save_message(
-        db, conversation_id, "user", body.message
-    )
+    user_message_id = await save_user_message(db, conversation_id, body.message)
     await db.commit()
     
     # Generate conversation title in background if new
     if body.conversation_id is None:
-        background_tasks.add_task(
-            generate_title_async,
+        await enqueue_task(
+            background_tasks, "generate_title", generate_title_async,
             conversation_id=conversation_id,
             user_message=body.message
         )
     
-    # Run emotion detection and memory bundle concurrently — they don't depend on each other
-    emotion_result, memory_bundle = await asyncio.gather(
+    # Run emotion detection, memory bundle and insights concurrently — they don't
+    # depend on each other (insights use their own session)
+    emotion_result, memory_bundle, insight = await asyncio.gather(
         main_app.emotion_service.detect_emotion(body.message),
         memory_service.build_memory_bundle(
             db=db,
@@ -404,80 +568,76 @@ async def crisis_generator():
             history=history,
             user_message=body.message,
         ),
+        load_user_insight(current_user.id),
         return_exceptions=True,
     )
 
     emotion = {"label": "neutral", "confidence": 0.5}
+    # Confidence of a successful detection; the emotion log is written in post-processing
+    logged_confidence = None
     if isinstance(emotion_result, Exception):
         logger.warning(f"Emotion detection failed: {emotion_result}")
     else:
         emotion = emotion_result
-        try:
-            await main_app.emotion_service.log_emotion(
-                db=db, user_id=current_user.id, conversation_id=conversation_id,
-                message_id=user_message_id, label=emotion["label"],
-                confidence=emotion["confidence"],
-            )
-        except Exception as e:
-            logger.warning(f"Failed to log emotion: {str(e)}")
+        logged_confidence = emotion["confidence"]
 
     if isinstance(memory_bundle, Exception):
         logger.warning(f"Memory bundle failed: {memory_bundle}")
         memory_bundle = None
 
-    # Get insight for response generation
-    insight = None
-    try:
-        insight = await emotion_analytics_service.generate_user_insights(
-            db=db, user_id=current_user.id, days=7
-        )
-    except Exception as e:
-        logger.warning(f"Analytics query failed: {str(e)}")
-    
+    if isinstance(insight, Exception):
+        logger.warning(f"Analytics query failed: {insight}")
+        insight = None
+
     # Only trigger crisis mode for actual crisis keywords, not just negative emotions
     actual_crisis = await main_app.emotion_service.detect_crisis_signals(body.message)
 
     async def stream_generator():
-        from app.db.session import SessionLocal
-
-        full_reply = ""
+        # The assistant row is inserted while the LLM decodes; once the stream
+        # ends its content is filled in with one UPDATE
+        placeholder = asyncio.create_task(save_assistant_placeholder(conversation_id))
+        reply_parts: List[str] = []
         try:
-            async for token in main_app.llm_service.get_response_stream(
-                user_message=body.message,
-                conversation_history=history,
-                emotional_insight=insight,
-                crisis_detected=actual_crisis,
-                memory_bundle=memory_bundle,
-            ):
-                full_reply += token
-                yield f"data: {token}\n\n"
-        except Exception as e:
-            logger.error(f"Stream generation error: {e}")
-            if not full_reply:
-                full_reply = main_app.llm_service._get_fallback_response(body.message)
-                yield f"data: {full_reply}\n\n"
-
-        # Save assistant message once stream is complete
-        saved_message_id = 0
-        async with SessionLocal() as save_db:
             try:
-                saved_message_id = await conversation_service.save_message(
-                    save_db, conversation_id, "assistant", full_reply
-                )
-                await save_db.commit()
+                async for token in main_app.llm_service.get_response_stream(
+                    user_message=body.message,
+                    conversation_history=history,
+                    emotional_insight=insight,
+                    crisis_detected=actual_crisis,
+                    memory_bundle=memory_bundle,
+                ):
+                    reply_parts.append(token)
+                    # Tokens are framed as they arrive; buffering them would
+                    # only delay the first visible text
+                    yield sse_frame(token.encode("utf-8"))
             except Exception as e:
-                logger.error(f"Failed to save streamed assistant message: {e}")
+                logger.error(f"Stream generation error: {e}")
+                if not reply_parts:
+                    fallback = main_app.llm_service._get_fallback_response(body.message)
+                    reply_parts.append(fallback)
+                    for frame in sse_chunks(fallback):
+                        yield frame
+        finally:
+            # Shielded: a client disconnect cancels this task mid-stream
+            saved_message_id = await asyncio.shield(finish_assistant_message(
+                placeholder, conversation_id, "".join(reply_parts)
+            ))
 
-        # Fire post-processing in background
-        asyncio.create_task(post_process_chat_async(
+        # Queued jobs and the response's background tasks run once the body
+        # has been sent, and (unlike a bare create_task) are never dropped
+        # mid-flight by garbage collection
+        await enqueue_task(
+            background_tasks, "post_process_chat", post_process_chat_async,
             user_id=current_user.id,
             conversation_id=conversation_id,
             message_id=user_message_id,
             history=history,
+            recent_summary=summarize_recent_turns(history),
             user_message=body.message,
             emotion_label=emotion.get("label", "neutral"),
-        ))
-        asyncio.create_task(context_refresh_service.maybe_prewarm(current_user.id))
+            emotion_confidence=logged_confidence,
+        )
+        background_tasks.add_task(context_refresh_service.maybe_prewarm, current_user.id)
 
         logger.info("[CTX-METRICS] %s", context_refresh_service.metrics())
 
@@ -490,4 +650,6 @@ async def stream_generator():
         )
         yield f"data: __END__{conversation_id}__{saved_message_id}\n\n"
 
-    return StreamingResponse(stream_generator(), media_type="text/event-stream")
+    return StreamingResponse(
+        stream_generator(), media_type="text/event-stream", background=background_tasks
+    )
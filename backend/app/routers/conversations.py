@@ -2,15 +2,17 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
-from app.services.conversation_service import ConversationService
+from app.services.conversation_service import ConversationService, forget_conversation_owner
+from app.services.context_manager import forget_conversation
 from app.models.conversation import Conversation
-from app.models.message import Message
+from app.models.crisis_event import CrisisEvent
 from app.models.emotion_log import EmotionLog
 from app.models.journal_entry import JournalEntry
-from app.models.crisis_event import CrisisEvent
+from app.models.memory import ConversationContextCache, SemanticMemory
+from app.models.message import Message
 from app.models.user import User
 from app.routers.auth import get_current_user
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, exists, func
 import app.main as main_app
 
 logger = logging.getLogger(__name__)
@@ -18,17 +20,30 @@
 router = APIRouter(prefix="/api/conversations", tags=["conversations"])
 conversation_service = ConversationService()
 
+# Rows owned by a conversation, in a safe delete order (rows pointing at
+# messages before the messages). Only needed where the database lacks the
+# ON DELETE CASCADE actions added by the conversation_delete_cascade
+# migration, which runs on PostgreSQL only.
+CONVERSATION_CHILD_MODELS = (
+    CrisisEvent, EmotionLog, JournalEntry, SemanticMemory, ConversationContextCache, Message,
+)
+
 
 @router.get("/")
 async def get_user_conversations(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     """Retrieve user conversations."""
     try:
-        stmt = select(Conversation).where(
-            Conversation.user_id == current_user.id
-        ).order_by(Conversation.updated_at.desc())
+        # Message counts come from the same query, one grouped join instead of
+        # a count per conversation
+        stmt = (
+            select(Conversation, func.count(Message.id).label("message_count"))
+            .outerjoin(Message, Message.conversation_id == Conversation.id)
+            .where(Conversation.user_id == current_user.id)
+            .group_by(Conversation.id)
+            .order_by(Conversation.updated_at.desc())
+        )
         
         result = await db.execute(stmt)
-        conversations = result.scalars().all()
         
         return [
             {
@@ -36,9 +51,9 @@ async def get_user_conversations(current_user: User = Depends(get_current_user),
                 "title": c.title or f"Conversation {c.id}",
                 "created_at": c.created_at,
                 "updated_at": c.updated_at,
-                "message_count": len(c.messages) if hasattr(c, 'messages') else 0,
+                "message_count": message_count,
             }
-            for c in conversations
+            for c, message_count in result.all()
         ]
     except Exception as e:
         logger.error(f"Failed to get conversations: {str(e)}")
@@ -66,7 +81,7 @@ async def get_conversation_messages(
         
         messages_stmt = select(Message).where(
             Message.conversation_id == conversation_id
-        ).order_by(Message.created_at.asc())
+        ).order_by(Message.id.asc())
         
         messages_result = await db.execute(messages_stmt)
         messages = messages_result.scalars().all()
@@ -113,7 +128,7 @@ async def finalize_conversation_title(
         # Get all messages
         messages_stmt = select(Message).where(
             Message.conversation_id == conversation_id
-        ).order_by(Message.created_at.asc())
+        ).order_by(Message.id.asc())
         
         messages_result = await db.execute(messages_stmt)
         messages = messages_result.scalars().all()
@@ -158,26 +173,25 @@ async def delete_conversation(
 ):
     """Delete conversation."""
     try:
-        stmt = select(Conversation).where(
-            (Conversation.id == conversation_id) & 
-            (Conversation.user_id == current_user.id)
-        )
-        
-        result = await db.execute(stmt)
-        conversation = result.scalar_one_or_none()
+        owned = (Conversation.id == conversation_id) & (Conversation.user_id == current_user.id)
+
+        if db.bind.dialect.name != "postgresql":
+            if not await db.scalar(select(exists().where(owned))):
+                raise HTTPException(status_code=404, detail="Conversation not found")
+            for model in CONVERSATION_CHILD_MODELS:
+                await db.execute(delete(model).where(model.conversation_id == conversation_id))
+
+        # On PostgreSQL messages, emotion logs, crisis events, journal entries
+        # and memories go with it through ON DELETE CASCADE; one statement
+        # also checks existence and ownership
+        result = await db.execute(delete(Conversation).where(owned))
         
-        if not conversation:
+        if result.rowcount == 0:
             raise HTTPException(status_code=404, detail="Conversation not found")
         
-        # Cascade delete related records first to avoid foreign key violations
-        await db.execute(delete(CrisisEvent).where(CrisisEvent.conversation_id == conversation_id))
-        await db.execute(delete(EmotionLog).where(EmotionLog.conversation_id == conversation_id))
-        await db.execute(delete(JournalEntry).where(JournalEntry.conversation_id == conversation_id))
-        await db.execute(delete(Message).where(Message.conversation_id == conversation_id))
-        
-        # Finally delete conversation
-        await db.delete(conversation)
         await db.commit()
+        forget_conversation(conversation_id)
+        forget_conversation_owner(conversation_id)
         
         return {"message": "Conversation deleted"}
     except HTTPException:
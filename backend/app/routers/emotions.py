@@ -1,4 +1,7 @@
 import logging
+from collections import Counter
+from typing import Sequence
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
@@ -7,10 +10,35 @@
 from app.models.user import User
 from app.models.emotion_log import EmotionLog
 from app.routers.auth import get_current_user
+from app.services.emotion_analytics_service import EmotionAnalyticsService
+import app.main as main_app
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/emotions", tags=["emotions"])
+emotion_analytics_service = EmotionAnalyticsService()
+
+TONE_MAP = {
+    "joy": "affirming",
+    "sadness": "gentle",
+    "anger": "validating",
+    "fear": "reassuring",
+    "surprise": "curious",
+    "disgust": "validating",
+    "neutral": "balanced",
+}
+
+APPROACH_MAP = {
+    "joy": "affirmation",
+    "sadness": "grounding",
+    "anger": "cognitive_reframe",
+    "fear": "grounding",
+    "surprise": "exploration",
+    "disgust": "cognitive_reframe",
+    "neutral": "exploration",
+}
+
+HIGH_RISK_EMOTIONS = frozenset({"sadness", "anger", "fear", "disgust"})
 
 
 @router.get("/insights/")
@@ -31,9 +59,7 @@ async def get_emotion_insights(
         }
     
     try:
-        from app.services.emotion_analytics_service import EmotionAnalyticsService
-        service = EmotionAnalyticsService()
-        insight = await service.generate_user_insights(db, current_user.id, days)
+        insight = await emotion_analytics_service.generate_user_insights(db, current_user.id, days)
         
         data = insight.dict()
         data["total_logs"] = data["log_count"]
@@ -96,19 +122,20 @@ async def get_daily_summary(
         start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
         end = start + timedelta(days=1)
         
-        stmt = select(EmotionLog).where(
+        # Only the columns the response uses; tags/notes stay in the database
+        stmt = select(
+            EmotionLog.id, EmotionLog.primary_emotion, EmotionLog.confidence, EmotionLog.created_at
+        ).where(
             (EmotionLog.user_id == current_user.id) &
             (EmotionLog.created_at >= start) &
             (EmotionLog.created_at < end)
         ).order_by(EmotionLog.created_at.asc())
         
         result = await db.execute(stmt)
-        emotion_logs = result.scalars().all()
+        emotion_logs = result.all()
         
-        emotion_counts = {}
-        for log in emotion_logs:
-            label = log.primary_emotion or "unknown"
-            emotion_counts[label] = emotion_counts.get(label, 0) + 1
+        # Labels are normalised at ingest to a handful of values; count in C
+        emotion_counts = dict(Counter(log.primary_emotion or "unknown" for log in emotion_logs))
         
         dominant = max(emotion_counts, key=emotion_counts.get) if emotion_counts else None
         
@@ -140,33 +167,35 @@ async def get_weekly_summary(
     current_user: User = Depends(get_current_user),
 ):
     """Generate an LLM-written personalised reflection on the user's emotional period."""
-    import app.main as main_app
-
     try:
         since_date = datetime.utcnow() - timedelta(days=days)
-        stmt = select(EmotionLog).where(
+        # Count per (emotion, day) in the database instead of loading every log
+        day = func.date(EmotionLog.created_at).label("day")
+        stmt = select(
+            EmotionLog.primary_emotion, day, func.count().label("count")
+        ).where(
             (EmotionLog.user_id == current_user.id) &
             (EmotionLog.created_at >= since_date)
-        ).order_by(EmotionLog.created_at.asc())
+        ).group_by(EmotionLog.primary_emotion, day).order_by(day)
 
         result = await db.execute(stmt)
-        logs = result.scalars().all()
+        rows = result.all()
 
-        if not logs or len(logs) < 3:
+        total = sum(row.count for row in rows)
+        if total < 3:
             return {"summary": "", "generated": False}
 
         emotion_counts = {}
         daily_breakdown = {}
 
-        for log in logs:
-            label = log.primary_emotion or "unknown"
-            emotion_counts[label] = emotion_counts.get(label, 0) + 1
-            day_key = log.created_at.date().isoformat() if log.created_at else "unknown"
+        for row in rows:
+            label = row.primary_emotion or "unknown"
+            emotion_counts[label] = emotion_counts.get(label, 0) + row.count
+            day_key = str(row.day) if row.day else "unknown"
             if day_key not in daily_breakdown:
                 daily_breakdown[day_key] = {}
-            daily_breakdown[day_key][label] = daily_breakdown[day_key].get(label, 0) + 1
+            daily_breakdown[day_key][label] = daily_breakdown[day_key].get(label, 0) + row.count
 
-        total = len(logs)
         dominant = max(emotion_counts, key=emotion_counts.get)
         dominance_pct = emotion_counts[dominant] / total
 
@@ -184,42 +213,23 @@ async def get_weekly_summary(
         return {"summary": "", "generated": False}
 
 
-def calculate_volatility(confidences: list) -> float:
-    """Calculate volatility."""
-    if not confidences or len(confidences) < 2:
+def calculate_volatility(confidences: Sequence[float]) -> float:
+    """Calculate volatility (population standard deviation, capped at 1)."""
+    if confidences is None or len(confidences) < 2:
         return 0.0
     
-    mean = sum(confidences) / len(confidences)
-    variance = sum((x - mean) ** 2 for x in confidences) / len(confidences)
-    return min(variance ** 0.5, 1.0)
+    # Single vectorised pass; also accepts an ndarray built from a result column
+    return float(min(np.std(np.asarray(confidences, dtype=np.float64)), 1.0))
 
 
 def suggest_tone(dominant_emotion: str) -> str:
     """Suggest tone."""
-    tone_map = {
-        "joy": "affirming",
-        "sadness": "gentle",
-        "anger": "validating",
-        "fear": "reassuring",
-        "surprise": "curious",
-        "disgust": "validating",
-        "neutral": "balanced",
-    }
-    return tone_map.get(dominant_emotion, "balanced")
+    return TONE_MAP.get(dominant_emotion, "balanced")
 
 
 def suggest_approach(dominant_emotion: str) -> str:
     """Suggest approach."""
-    approach_map = {
-        "joy": "affirmation",
-        "sadness": "grounding",
-        "anger": "cognitive_reframe",
-        "fear": "grounding",
-        "surprise": "exploration",
-        "disgust": "cognitive_reframe",
-        "neutral": "exploration",
-    }
-    return approach_map.get(dominant_emotion, "exploration")
+    return APPROACH_MAP.get(dominant_emotion, "exploration")
 
 
 def is_high_risk(emotion_counts: dict) -> bool:
@@ -227,11 +237,9 @@ def is_high_risk(emotion_counts: dict) -> bool:
     if not emotion_counts:
         return False
     
-    high_risk_emotions = {"sadness", "anger", "fear", "disgust"}
     total = sum(emotion_counts.values())
-    
-    for emotion, count in emotion_counts.items():
-        if emotion in high_risk_emotions and (count / total) > 0.4:
-            return True
-    
-    return False
+    return any(
+        emotion_counts[emotion] / total > 0.4
+        for emotion in HIGH_RISK_EMOTIONS
+        if emotion in emotion_counts
+    )
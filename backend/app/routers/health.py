@@ -1,3 +1,4 @@
+import time
 from fastapi import APIRouter
 from datetime import datetime
 from app.services.engines.factory import (
@@ -9,18 +10,31 @@
 
 router = APIRouter(tags=["health"])
 
+# (whole second, its ISO timestamp); probes within one second share the string
+_timestamp_cache = (0, "")
 
+
+def _timestamp() -> str:
+    global _timestamp_cache
+    second = int(time.time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return _timestamp_cache[1]
+
+
+# async def: nothing here blocks, and a plain def would be sent to the
+# threadpool on every probe
 @router.get("/health")
-def health_check():
+async def health_check():
     return {
         "status": "ok",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _timestamp(),
         "service": "serenity-backend"
     }
 
 
 @router.get("/health/engines")
-def engine_health():
+async def engine_health():
     """Check status of all AI engines."""
     try:
         emotion_engine = get_emotion_engine()
@@ -29,7 +43,7 @@ def engine_health():
         
         return {
             "status": "ok",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             "engines": {
                 "emotion": {
                     "provider": settings.emotion_provider,
@@ -51,6 +65,6 @@ def engine_health():
     except Exception as e:
         return {
             "status": "error",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             "error": str(e)
         }
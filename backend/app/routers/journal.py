@@ -1,22 +1,34 @@
+import asyncio
+import base64
+import hashlib
 import logging
+from collections import OrderedDict
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from functools import lru_cache
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
-from app.db.session import get_db
+from sqlalchemy import select, func, and_, tuple_
+from sqlalchemy.orm import load_only
+from app.db.session import get_db, SessionLocal
 from app.models.user import User
 from app.models.journal_entry import JournalEntry
 from app.routers.auth import get_current_user
 from app.services.ollama_service import GeminiService
 from app.services.journal_service import JournalService
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
 
 logger = logging.getLogger(__name__)
 
-# Initialize Gemini service for title generation
-gemini_service = GeminiService()
 journal_service = JournalService()
 
+
+@lru_cache()
+def get_gemini_service() -> GeminiService:
+    """Title-generation service, created on first use and shared afterwards."""
+    return GeminiService()
+
+
 router = APIRouter(prefix="/api/journal", tags=["journal"])
 
 SERENITY_QUOTES = [
@@ -30,6 +42,15 @@
 ]
 
 
+# Gemini titles by content digest; fallbacks are not cached so a later
+# create can still get a generated title
+_SMART_TITLE_CACHE_SIZE = 1024
+_smart_title_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+# Characters of entry content shown in list pages
+CONTENT_PREVIEW_CHARS = 200
+
+
 class JournalEntryCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     content: str = Field(..., min_length=1)
@@ -44,53 +65,77 @@ class JournalEntryUpdate(BaseModel):
     tags: list[str] = Field(None)
 
 
-class JournalEntryResponse(BaseModel):
+class JournalEntryListItem(TypedDict):
     id: int
-    title: str
+    title: str | None
     content: str
-    emotion: str
+    emotion: str | None
+    mood: str | None
     tags: list[str]
-    created_at: datetime
-    updated_at: datetime
+    auto_extract: bool | None
+    serenity_thought: str | None
+    ai_summary: str | None
+    ai_confidence: float | None
+    extraction_method: str | None
+    created_at: str | None
+    updated_at: str | None
+
+
+class JournalEntryList(TypedDict):
+    entries: list[JournalEntryListItem]
+    total: int
+    skip: int
+    limit: int
+    next_cursor: str | None
+    manual_entries: int
+    auto_entries: int
+    dominant_emotion: dict | None
+    quote_of_day: dict | None
 
-    class Config:
-        from_attributes = True
+
+# Serializes the whole list page to JSON in one pydantic-core call
+_ENTRY_LIST_ADAPTER = TypeAdapter(JournalEntryList)
+
+
+# Placeholder strings the frontend has sent in place of a tag
+NULL_TAG_TOKENS = frozenset({"null", "none", "undefined", "[]"})
+
+
+def _clean_tag(text):
+    if text is None:
+        return None
+    normalized = str(text).strip()
+    if not normalized or normalized.lower() in NULL_TAG_TOKENS:
+        return None
+    return normalized
 
 
 def format_tags(value):
-    def _clean(text):
-        if text is None:
-            return None
-        normalized = str(text).strip()
-        if not normalized or normalized.lower() in {"null", "none", "undefined", "[]"}:
-            return None
-        return normalized
-
-    if isinstance(value, list):
-        cleaned = []
-        seen = set()
-        for t in value:
-            cleaned_value = _clean(t)
-            if cleaned_value and cleaned_value not in seen:
-                seen.add(cleaned_value)
-                cleaned.append(cleaned_value)
-        return cleaned
     if isinstance(value, str):
-        cleaned = [_clean(part) for part in value.split(",")]
-        deduped = []
-        for c in cleaned:
-            if c and c not in deduped:
-                deduped.append(c)
-        return deduped
-    return []
+        value = value.split(",")
+    elif not isinstance(value, list):
+        return []
+    # dict.fromkeys dedupes while keeping first-seen order
+    return list(dict.fromkeys(cleaned for tag in value if (cleaned := _clean_tag(tag))))
 
 
-def get_quote_of_day(reference: datetime | None = None):
-    day = reference or datetime.utcnow()
+def content_preview(content):
+    """List preview of content fetched as its first CONTENT_PREVIEW_CHARS + 1 characters."""
+    # A character past the limit means the entry was longer; no len() needed
+    if content and content[CONTENT_PREVIEW_CHARS:]:
+        return content[:CONTENT_PREVIEW_CHARS] + "..."
+    return content
+
+
+@lru_cache(maxsize=2)
+def _quote_for_day(ordinal: int):
     if not SERENITY_QUOTES:
         return None
-    index = day.toordinal() % len(SERENITY_QUOTES)
-    return SERENITY_QUOTES[index]
+    return SERENITY_QUOTES[ordinal % len(SERENITY_QUOTES)]
+
+
+def get_quote_of_day(reference: datetime | None = None):
+    return _quote_for_day((reference or datetime.utcnow()).toordinal())
 
 
 async def get_dominant_emotion_summary(db: AsyncSession, user_id: int):
@@ -113,6 +158,63 @@ async def get_dominant_emotion_summary(db: AsyncSession, user_id: int):
     }
 
 
+async def load_dominant_emotion_summary(user_id: int):
+    async with SessionLocal() as summary_db:
+        return await get_dominant_emotion_summary(summary_db, user_id)
+
+
+async def entries_etag(db: AsyncSession, user_id: int, *params) -> str:
+    """
+    Weak ETag for a user's entry list under the given query parameters.
+
+    Count, highest id and latest write time change on every create, delete
+    and edit; the day ordinal covers the quote of the day.
+    """
+    fingerprint = (await db.execute(
+        select(
+            func.count(),
+            func.max(JournalEntry.id),
+            func.max(func.coalesce(JournalEntry.updated_at, JournalEntry.created_at)),
+        ).where(JournalEntry.user_id == user_id)
+    )).one()
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (user_id, *fingerprint, datetime.utcnow().toordinal(), *params):
+        digest.update(str(part).encode("utf-8") + b"\0")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def encode_entries_cursor(created_at: datetime, entry_id: int) -> str:
+    """Opaque keyset cursor pointing just past the given entry."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{entry_id}".encode("utf-8")).decode("ascii")
+
+
+def decode_entries_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, entry_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(entry_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+async def count_entries(user_id: int, filters: list):
+    """Filtered total and the manual/auto split, in one pass over the user's rows."""
+    count_stmt = select(
+        func.count().filter(and_(*filters)) if filters else func.count(),
+        # auto_extract is NOT NULL DEFAULT false, so there is no NULL case
+        func.count().filter(JournalEntry.auto_extract == False),
+        func.count().filter(JournalEntry.auto_extract == True),
+    ).where(JournalEntry.user_id == user_id)
+    async with SessionLocal() as count_db:
+        return (await count_db.execute(count_stmt)).one()
+
+
 async def generate_smart_title(content: str) -> str:
     """
     Generate a meaningful title from journal content using Gemini.
@@ -124,14 +226,27 @@ async def generate_smart_title(content: str) -> str:
         if len(content) < 50:
             return content.split("\n")[0][:100]
 
+        # Identical content (a re-submitted entry) reuses its earlier title
+        content_key = hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+        cached_title = _smart_title_cache.get(content_key)
+        if cached_title is not None:
+            _smart_title_cache.move_to_end(content_key)
+            return cached_title
+
         # Call Gemini to generate title
-        title = await gemini_service.generate_conversation_title(content)
+        title = await get_gemini_service().generate_conversation_title(content)
 
         # Ensure title isn't empty and isn't too long
         if not title or len(title.strip()) == 0:
             return content.split(".")[0][:100]
 
-        return title[:100]  # Max 100 chars
+        title = title[:100]  # Max 100 chars
+        # generate_conversation_title answers failures with this placeholder
+        if not title.startswith("Conversation about "):
+            _smart_title_cache[content_key] = title
+            if len(_smart_title_cache) > _SMART_TITLE_CACHE_SIZE:
+                _smart_title_cache.popitem(last=False)
+        return title
 
     except Exception as e:
         # Non-blocking: fallback to first sentence
@@ -142,78 +257,116 @@ async def generate_smart_title(content: str) -> str:
 
 @router.get("/entries/", response_model=dict)
 async def list_entries(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     emotion: str = Query(None),
     auto_extract: bool = Query(None),
+    cursor: str = Query(None),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """List journal entries with optional filtering by emotion and auto_extract status."""
+    """
+    List journal entries with optional filtering by emotion and auto_extract status.
+
+    Pages by skip, or by cursor: the next_cursor of the previous page, which
+    seeks past it on the index instead of scanning the skipped rows.
+    """
     try:
-        query = select(JournalEntry).where(JournalEntry.user_id == current_user.id)
-        
+        # A poll that finds nothing changed gets a 304 after one small query
+        etag = await entries_etag(db, current_user.id, skip, limit, emotion, auto_extract, cursor)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        filters = []
         if emotion:
-            query = query.where(JournalEntry.emotion == emotion)
-        
+            filters.append(JournalEntry.emotion == emotion)
         if auto_extract is not None:
-            query = query.where(JournalEntry.auto_extract == auto_extract)
-        
-        query = query.order_by(JournalEntry.created_at.desc()).offset(skip).limit(limit)
+            filters.append(JournalEntry.auto_extract == auto_extract)
         
-        result = await db.execute(query)
-        entries = result.scalars().all()
+        page_filters = []
+        if cursor:
+            after_created_at, after_id = decode_entries_cursor(cursor)
+            page_filters.append(
+                tuple_(JournalEntry.created_at, JournalEntry.id) < tuple_(after_created_at, after_id)
+            )
+            skip = 0
         
-        count_stmt = select(func.count(JournalEntry.id)).where(JournalEntry.user_id == current_user.id)
-        if emotion:
-            count_stmt = count_stmt.where(JournalEntry.emotion == emotion)
-        if auto_extract is not None:
-            count_stmt = count_stmt.where(JournalEntry.auto_extract == auto_extract)
-        
-        count_result = await db.execute(count_stmt)
-        total = count_result.scalar()
+        # Only the listed fields, with content cut to the preview in the
+        # database; one extra character tells whether it was longer
+        query = (
+            select(
+                JournalEntry.id,
+                JournalEntry.title,
+                func.substr(JournalEntry.content, 1, CONTENT_PREVIEW_CHARS + 1).label("content"),
+                JournalEntry.emotion,
+                JournalEntry.mood,
+                JournalEntry.tags,
+                JournalEntry.auto_extract,
+                JournalEntry.extracted_insights,
+                JournalEntry.ai_summary,
+                JournalEntry.ai_confidence,
+                JournalEntry.extraction_method,
+                JournalEntry.created_at,
+                JournalEntry.updated_at,
+            )
+            .where(JournalEntry.user_id == current_user.id, *filters, *page_filters)
+            .order_by(JournalEntry.created_at.desc(), JournalEntry.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
         
-        manual_stmt = select(func.count(JournalEntry.id)).where(
-            JournalEntry.user_id == current_user.id
-        ).where(or_(JournalEntry.auto_extract == False, JournalEntry.auto_extract.is_(None)))
-
-        auto_stmt = select(func.count(JournalEntry.id)).where(
-            (JournalEntry.user_id == current_user.id) &
-            (JournalEntry.auto_extract == True)
+        # The counts and the emotion summary use their own sessions, so all
+        # three queries run at once on separate pooled connections
+        result, (total, manual_count, auto_count), dominant_emotion = await asyncio.gather(
+            db.execute(query),
+            count_entries(current_user.id, filters),
+            load_dominant_emotion_summary(current_user.id),
         )
-
-        manual_count = (await db.execute(manual_stmt)).scalar() or 0
-        auto_count = (await db.execute(auto_stmt)).scalar() or 0
-        dominant_emotion = await get_dominant_emotion_summary(db, current_user.id)
+        entries = result.all()
         quote_of_day = get_quote_of_day()
 
-        return {
-            "entries": [
-                {
-                    "id": e.id,
-                    "title": e.title,
-                    "content": e.content[:200] + "..." if len(e.content or "") > 200 else e.content,
-                    "emotion": journal_service.normalize_emotion_label(e.emotion),
-                    "mood": e.mood,
-                    "tags": format_tags(e.tags),
-                    "auto_extract": e.auto_extract,
-                    "serenity_thought": e.extracted_insights,
-                    "ai_summary": e.ai_summary,
-                    "ai_confidence": e.ai_confidence,
-                    "extraction_method": e.extraction_method,
-                    "created_at": e.created_at.isoformat() if e.created_at else None,
-                    "updated_at": e.updated_at.isoformat() if e.updated_at else None
-                }
-                for e in entries
-            ],
+        normalize_emotion = journal_service.normalize_emotion_label
+        entry_rows = []
+        for e in entries:
+            entry_rows.append({
+                "id": e.id,
+                "title": e.title,
+                "content": content_preview(e.content),
+                "emotion": normalize_emotion(e.emotion),
+                "mood": e.mood,
+                "tags": format_tags(e.tags),
+                "auto_extract": e.auto_extract,
+                "serenity_thought": e.extracted_insights,
+                "ai_summary": e.ai_summary,
+                "ai_confidence": e.ai_confidence,
+                "extraction_method": e.extraction_method,
+                "created_at": e.created_at.isoformat() if e.created_at else None,
+                "updated_at": e.updated_at.isoformat() if e.updated_at else None
+            })
+
+        body: JournalEntryList = {
+            "entries": entry_rows,
             "total": total,
             "skip": skip,
             "limit": limit,
+            "next_cursor": (
+                encode_entries_cursor(entries[-1].created_at, entries[-1].id)
+                if len(entries) == limit else None
+            ),
             "manual_entries": manual_count,
             "auto_entries": auto_count,
             "dominant_emotion": dominant_emotion,
             "quote_of_day": quote_of_day
         }
+        # Returned as-is, skipping FastAPI's response_model encoding pass
+        return Response(
+            content=_ENTRY_LIST_ADAPTER.dump_json(body),
+            media_type="application/json",
+            headers={"ETag": etag},
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to list entries: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to fetch entries")
@@ -226,11 +379,13 @@ async def create_entry(
     db: AsyncSession = Depends(get_db)
 ):
     """Create journal entry with AI-generated smart title if not provided."""
+    title_task = None
     try:
         requested_title = (payload.title or "").strip()
         uses_auto_title = False
         if not requested_title or requested_title.lower() in {"today's entry", "todays entry"}:
-            requested_title = await generate_smart_title(payload.content)
+            # The LLM call runs while the row is prepared
+            title_task = asyncio.create_task(generate_smart_title(payload.content))
             uses_auto_title = True
 
         normalized_emotion = journal_service.normalize_emotion_label(payload.emotion)
@@ -246,10 +401,13 @@ async def create_entry(
             auto_extract=False,
             extraction_method="manual_ai_title" if uses_auto_title else "manual"
         )
+        if title_task is not None:
+            requested_title = entry.title = await title_task
         
         db.add(entry)
+        # The INSERT returns id and created_at, and the session does not
+        # expire on commit, so no refresh query is needed
         await db.commit()
-        await db.refresh(entry)
         
         logger.info(
             "Journal entry created: ID=%s, title='%s', emotion=%s, auto_extract=%s",
@@ -271,6 +429,8 @@ async def create_entry(
         }
     except Exception as e:
         logger.error(f"Failed to create entry: {str(e)}")
+        if title_task is not None:
+            title_task.cancel()
         await db.rollback()
         raise HTTPException(status_code=500, detail="Failed to create entry")
 
@@ -346,8 +506,8 @@ async def update_entry(
         if payload.tags is not None:
             entry.tags = format_tags(payload.tags)
         
+        # updated_at comes back from the UPDATE's RETURNING clause
         await db.commit()
-        await db.refresh(entry)
         
         return {
             "id": entry.id,
@@ -375,7 +535,8 @@ async def delete_entry(
 ):
     """Delete journal entry."""
     try:
-        stmt = select(JournalEntry).where(
+        # Deleting needs only the primary key
+        stmt = select(JournalEntry).options(load_only(JournalEntry.id)).where(
             (JournalEntry.id == entry_id) &
             (JournalEntry.user_id == current_user.id)
         )
@@ -408,29 +569,38 @@ async def search_entries(
     try:
         search_term = f"%{q}%"
         
-        stmt = select(JournalEntry).where(
+        # Both ILIKEs are served by the trigram GIN indexes on PostgreSQL
+        stmt = select(
+            JournalEntry.id,
+            JournalEntry.title,
+            func.substr(JournalEntry.content, 1, CONTENT_PREVIEW_CHARS + 1).label("content"),
+            JournalEntry.emotion,
+            JournalEntry.auto_extract,
+            JournalEntry.created_at,
+        ).where(
             (JournalEntry.user_id == current_user.id) &
             ((JournalEntry.title.ilike(search_term)) |
              (JournalEntry.content.ilike(search_term)))
         ).order_by(JournalEntry.created_at.desc()).limit(20)
         
         result = await db.execute(stmt)
-        entries = result.scalars().all()
+        entries = result.all()
+        
+        results = []
+        for e in entries:
+            results.append({
+                "id": e.id,
+                "title": e.title,
+                "content": content_preview(e.content),
+                "emotion": e.emotion,
+                "auto_extract": e.auto_extract,
+                "created_at": e.created_at.isoformat() if e.created_at else None
+            })
         
         return {
             "query": q,
-            "results": [
-                {
-                    "id": e.id,
-                    "title": e.title,
-                    "content": e.content[:200] + "..." if len(e.content or "") > 200 else e.content,
-                    "emotion": e.emotion,
-                    "auto_extract": e.auto_extract,
-                    "created_at": e.created_at.isoformat() if e.created_at else None
-                }
-                for e in entries
-            ],
-            "total": len(entries)
+            "results": results,
+            "total": len(results)
         }
     except Exception as e:
         logger.error(f"Failed to search entries: {str(e)}")
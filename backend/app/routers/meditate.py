@@ -1,14 +1,13 @@
 import json
 import re
 import logging
-import httpx
 from collections import Counter
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, Response
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, desc, func
 
 from app.db.session import get_db
 from app.models.user import User
@@ -18,6 +17,7 @@
 from app.routers.auth import get_current_user
 from app.services.engines.factory import get_llm_engine
 from app.core.config import settings
+from app.core.http_client import get_http_client
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 
@@ -83,13 +83,14 @@ async def get_meditation_suggestion(
         )
         emotion_logs = (await db.execute(emotion_stmt)).scalars().all()
 
+        # Three excerpts of 150 characters are all the prompt uses
         journal_stmt = (
-            select(JournalEntry)
+            select(JournalEntry.emotion, func.substr(JournalEntry.content, 1, 150).label("content"))
             .where(JournalEntry.user_id == current_user.id)
             .order_by(desc(JournalEntry.created_at))
-            .limit(5)
+            .limit(3)
         )
-        journal_entries = (await db.execute(journal_stmt)).scalars().all()
+        journal_entries = (await db.execute(journal_stmt)).all()
 
         if emotion_logs:
             counts = Counter(log.primary_emotion for log in emotion_logs)
@@ -101,8 +102,8 @@ async def get_meditation_suggestion(
 
         if journal_entries:
             excerpts = []
-            for e in journal_entries[:3]:
-                text = (e.content or "")[:150]
+            for e in journal_entries:
+                text = e.content or ""
                 excerpts.append(f"[{e.emotion or 'neutral'}] {text}")
             journal_context = "Recent journal excerpts:\n" + "\n---\n".join(excerpts)
         else:
@@ -413,18 +414,19 @@ async def speak(
     text = request.text.strip()[:500]  # cap length for safety
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.post(
-                f"{settings.kokoro_url}/v1/audio/speech",
-                json={
-                    "model": "kokoro",
-                    "input": text,
-                    "voice": settings.kokoro_voice,
-                    "response_format": "mp3",
-                },
-            )
-            resp.raise_for_status()
-            audio_bytes = resp.content
+        client = get_http_client()
+        resp = await client.post(
+            f"{settings.kokoro_url}/v1/audio/speech",
+            json={
+                "model": "kokoro",
+                "input": text,
+                "voice": settings.kokoro_voice,
+                "response_format": "mp3",
+            },
+            timeout=30.0,
+        )
+        resp.raise_for_status()
+        audio_bytes = resp.content
 
         return Response(
             content=audio_bytes,
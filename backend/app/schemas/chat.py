@@ -7,6 +7,9 @@ class ChatRequest(BaseModel):
     conversation_id: Optional[int] = Field(None, gt=0, description="Conversation ID (null = new conversation)")
 
     class Config:
+        # Stripped in pydantic-core before the length checks, so a
+        # whitespace-only message is rejected like an empty one
+        str_strip_whitespace = True
         json_schema_extra = {
             "example": {
                 "message": "I'm feeling anxious today",
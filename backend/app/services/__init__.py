@@ -1,13 +1,31 @@
-from app.services.conversation_service import ConversationService
-from app.services.ollama_service import GeminiService
-from app.services.emotion_service import EmotionService
-from app.services.journal_service import JournalService
-from app.services.memory_service import MemoryService
-
-__all__ = [
-    "ConversationService",
-    "GeminiService",
-    "EmotionService",
-    "JournalService",
-    "MemoryService",
-]
+"""
+Service classes, importable as ``from app.services import X``.
+
+Each is imported on first access (PEP 562), so importing one service module
+does not load every other service and its dependencies.
+"""
+
+import importlib
+
+_NAME_TO_MODULE = {
+    "ConversationService": "conversation_service",
+    "GeminiService": "ollama_service",
+    "EmotionService": "emotion_service",
+    "JournalService": "journal_service",
+    "MemoryService": "memory_service",
+}
+
+__all__ = list(_NAME_TO_MODULE)
+
+
+def __getattr__(name):
+    module_name = _NAME_TO_MODULE.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -3,7 +3,9 @@
 Reduces tokens while maintaining context quality using hierarchical approach.
 """
 
-from typing import List, Dict, Optional
+import re
+from collections import OrderedDict
+from typing import List, Dict, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.message import Message
@@ -11,6 +13,30 @@
 
 logger = logging.getLogger(__name__)
 
+# Transcripts of recently active conversations, keyed by conversation id and
+# stored with the id of each cached message. Rows are never edited once they
+# have content (a streamed reply is an empty placeholder until it is filled,
+# and empty rows are left out), so each turn only re-reads the tail of the
+# transcript: ids are assigned at flush but become visible at commit, so
+# concurrent turns in one conversation (a double submit, or stream and
+# non-stream) can commit a lower id after a higher one was already cached.
+_TRANSCRIPT_CACHE_SIZE = 256
+_TRANSCRIPT_REREAD_ROWS = 8
+_transcript_cache: "OrderedDict[int, Tuple[List[int], List[Dict]]]" = OrderedDict()
+
+
+def forget_conversation(conversation_id: int) -> None:
+    """Drop the cached transcript of a deleted conversation."""
+    _transcript_cache.pop(conversation_id, None)
+
+
+# Emotional keywords that make an older message worth keeping. Matched as
+# substrings (so "unhappy" and "helpless" count) in a single regex scan.
+_EMOTIONAL_WORDS_RE = re.compile(
+    "sad|happy|anxious|afraid|angry|excited|worried|stressed|joy|love|help|important",
+    re.IGNORECASE,
+)
+
 
 class ContextManager:
     """Hierarchical context management for long conversations."""
@@ -37,29 +63,17 @@ async def get_optimized_history(
         Returns tokens by ~40-60% vs naive approach while maintaining context.
         """
         
-        # Fetch all messages for this conversation
-        result = await db.execute(
-            select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
-        )
-        all_messages = result.scalars().all()
+        all_dicts = await self._load_transcript(db, conversation_id)
         
-        if not all_messages:
+        if not all_dicts:
             return []
         
-        logger.info(f"[CONTEXT] Total messages: {len(all_messages)}")
-        
-        # Convert to dicts
-        all_dicts = [
-            {"role": m.role.value, "content": m.content}
-            for m in all_messages
-        ]
+        logger.info(f"[CONTEXT] Total messages: {len(all_dicts)}")
         
-        # If few messages, return all
+        # If few messages, return all (as a copy; all_dicts is the cached list)
         if len(all_dicts) <= self.recent_limit:
             logger.info(f"[CONTEXT] Few messages ({len(all_dicts)}), returning all")
-            return all_dicts
+            return list(all_dicts)
         
         # Get recent messages (last N)
         recent = all_dicts[-self.recent_limit:]
@@ -89,6 +103,49 @@ async def get_optimized_history(
         
         return result
 
+    async def _load_transcript(self, db: AsyncSession, conversation_id: int) -> List[Dict]:
+        """
+        Return every message of the conversation, reading only the tail of the cache.
+
+        The last _TRANSCRIPT_REREAD_ROWS cached rows are read again with
+        anything newer, and that tail is rebuilt from the database, so a row
+        committed late with a lower id (or a deleted one) is not missed.
+
+        The returned list is the cached one and must not be mutated; a new
+        list replaces it whenever the tail changes.
+        """
+        ids, messages = _transcript_cache.get(conversation_id, ([], []))
+        keep = max(0, len(ids) - _TRANSCRIPT_REREAD_ROWS)
+        after_id = ids[keep - 1] if keep else 0
+
+        result = await db.execute(
+            select(Message.id, Message.role, Message.content)
+            .where(
+                Message.conversation_id == conversation_id,
+                Message.id > after_id,
+                # A streamed reply still being generated, possibly in another
+                # process; it joins the tail once finalize_message fills it
+                Message.content != "",
+            )
+            .order_by(Message.id.asc())
+        )
+        rows = result.all()
+        tail_ids = [row.id for row in rows]
+        if tail_ids != ids[keep:]:
+            ids = ids[:keep] + tail_ids
+            messages = messages[:keep] + [
+                {"role": row.role.value, "content": row.content} for row in rows
+            ]
+
+        if messages:
+            _transcript_cache[conversation_id] = (ids, messages)
+            _transcript_cache.move_to_end(conversation_id)
+            if len(_transcript_cache) > _TRANSCRIPT_CACHE_SIZE:
+                _transcript_cache.popitem(last=False)
+        else:
+            _transcript_cache.pop(conversation_id, None)
+        return messages
+
     def _score_importance(self, messages: List[Dict]) -> List[Dict]:
         """
         Score messages by importance using heuristics.
@@ -100,18 +157,14 @@ def _score_importance(self, messages: List[Dict]) -> List[Dict]:
         """
         scores = []
         
-        emotional_words = {"sad", "happy", "anxious", "afraid", "angry", "excited", 
-                          "worried", "stressed", "joy", "love", "help", "important"}
-        
         for msg in messages:
             score = 0
-            content_lower = msg["content"].lower()
             
             # Length bonus
             score += min(len(msg["content"]) / 200, 2)  # Max 2 points
             
             # Emotional content bonus
-            if any(word in content_lower for word in emotional_words):
+            if _EMOTIONAL_WORDS_RE.search(msg["content"]):
                 score += 1
             
             # Assistant responses tend to be important
@@ -3,7 +3,12 @@
 Handles multi-turn conversation persistence and history retrieval.
 """
 
-from sqlalchemy import select, desc
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from sqlalchemy import select, desc, exists, update, delete
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from app.models.conversation import Conversation
@@ -11,6 +16,19 @@
 from app.models.user import User
 from datetime import datetime
 
+# Conversations recently confirmed as owned, mapped to (owner id, expiry).
+# Ownership never changes, so only a delete invalidates an entry; the TTL
+# bounds how long another worker's delete can go unseen. Negative answers
+# are never cached.
+_OWNERSHIP_CACHE_TTL_SECONDS = 300
+_OWNERSHIP_CACHE_SIZE = 10000
+_conversation_owners: "OrderedDict[int, Tuple[int, float]]" = OrderedDict()
+
+
+def forget_conversation_owner(conversation_id: int) -> None:
+    """Drop the cached owner of a deleted conversation."""
+    _conversation_owners.pop(conversation_id, None)
+
 
 class ConversationService:
     """
@@ -38,12 +56,9 @@ async def create_conversation(
         Raises:
             ValueError: If user doesn't exist
         """
-        # Validate user exists
-        user_result = await db.execute(
-            select(User).where(User.id == user_id)
-        )
-        user = user_result.scalar_one_or_none()
-        if not user:
+        # Validate user exists (EXISTS, so no row is loaded)
+        user_exists = await db.scalar(select(exists().where(User.id == user_id)))
+        if not user_exists:
             raise ValueError(f"User {user_id} not found")
 
         # Create conversation
@@ -75,22 +90,21 @@ async def get_conversation_history(
         Raises:
             ValueError: If conversation doesn't exist
         """
-        # Check conversation exists
-        conv_result = await db.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
+        # Check conversation exists (EXISTS, so no row is loaded)
+        conversation_exists = await db.scalar(
+            select(exists().where(Conversation.id == conversation_id))
         )
-        conversation = conv_result.scalar_one_or_none()
-        if not conversation:
+        if not conversation_exists:
             raise ValueError(f"Conversation {conversation_id} not found")
 
-        # Get last N messages ordered by creation
+        # Get last N messages, newest first off the index, then restore order
         messages_result = await db.execute(
             select(Message)
             .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at.asc())
+            .order_by(Message.id.desc())
             .limit(limit)
         )
-        messages = messages_result.scalars().all()
+        messages = list(reversed(messages_result.scalars().all()))
 
         # Format as OpenAI-style list
         history = [
@@ -119,16 +133,10 @@ async def save_message(
             message_id (int)
 
         Raises:
-            ValueError: If conversation doesn't exist or role invalid
+            ValueError: If conversation doesn't exist or role invalid. A
+                missing conversation is detected by the foreign key on flush,
+                which rolls the session back.
         """
-        # Validate conversation exists
-        conv_result = await db.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
-        )
-        conversation = conv_result.scalar_one_or_none()
-        if not conversation:
-            raise ValueError(f"Conversation {conversation_id} not found")
-
         # Validate role
         valid_roles = {"user", "assistant", "system"}
         if role not in valid_roles:
@@ -141,11 +149,68 @@ async def save_message(
             content=content
         )
         db.add(message)
-        await db.flush()
+        try:
+            # The conversation foreign key checks existence in the INSERT
+            # itself, saving a query on every turn
+            await db.flush()
+        except IntegrityError as e:
+            await db.rollback()
+            raise ValueError(f"Conversation {conversation_id} not found") from e
         message_id = message.id
 
         return message_id
 
+    def add_message(
+        self, db: AsyncSession, conversation_id: int, role: str, content: str
+    ) -> Message:
+        """
+        Stage a message in a conversation already checked in this transaction.
+
+        Unlike save_message there is no existence query and no flush; the
+        INSERT goes out with the caller's next flush or commit.
+
+        Args:
+            db: Async database session
+            conversation_id: Conversation ID (validated by the caller)
+            role: Message role ('user', 'assistant', 'system')
+            content: Message content
+
+        Returns:
+            The pending Message; its id is set once flushed.
+        """
+        message = Message(
+            conversation_id=conversation_id,
+            role=MessageRole(role),
+            content=content
+        )
+        db.add(message)
+        return message
+
+    async def finalize_message(
+        self, db: AsyncSession, message_id: int, content: str
+    ) -> bool:
+        """
+        Fill in a message saved before its content was known (streamed replies).
+
+        Args:
+            db: Async database session
+            message_id: Message ID returned by save_message
+            content: Final message content
+
+        Returns:
+            True if the message was kept, False if it was deleted because
+            content is empty.
+        """
+        if content:
+            await db.execute(
+                update(Message).where(Message.id == message_id).values(content=content)
+            )
+            return True
+
+        # Nothing was generated; an empty turn must not reach later prompts
+        await db.execute(delete(Message).where(Message.id == message_id))
+        return False
+
     async def validate_conversation_ownership(
         self, db: AsyncSession, user_id: int, conversation_id: int
     ) -> bool:
@@ -160,14 +225,25 @@ async def validate_conversation_ownership(
         Returns:
             True if user owns conversation, False otherwise
         """
-        result = await db.execute(
-            select(Conversation).where(
+        cached = _conversation_owners.get(conversation_id)
+        if cached is not None and cached[0] == user_id and cached[1] > time.monotonic():
+            _conversation_owners.move_to_end(conversation_id)
+            return True
+
+        owned = bool(await db.scalar(
+            select(exists().where(
                 (Conversation.id == conversation_id)
                 & (Conversation.user_id == user_id)
+            ))
+        ))
+        if owned:
+            _conversation_owners[conversation_id] = (
+                user_id, time.monotonic() + _OWNERSHIP_CACHE_TTL_SECONDS
             )
-        )
-        conversation = result.scalar_one_or_none()
-        return conversation is not None
+            _conversation_owners.move_to_end(conversation_id)
+            if len(_conversation_owners) > _OWNERSHIP_CACHE_SIZE:
+                _conversation_owners.popitem(last=False)
+        return owned
 
     async def auto_title_conversation(
         self, db: AsyncSession, conversation_id: int, first_message: str
@@ -186,13 +262,7 @@ async def auto_title_conversation(
         if len(first_message.split()) > 5:
             title += "..."
 
-        # Update conversation
-        result = await db.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
-        )
-        conversation = result.scalar_one()
-        conversation.title = title
-        await db.flush()
+        await self.update_conversation_title(db, conversation_id, title)
 
     async def update_conversation_title(
         self, db: AsyncSession, conversation_id: int, title: str
@@ -205,10 +275,9 @@ async def update_conversation_title(
             conversation_id: Conversation ID
             title: New title
         """
-        result = await db.execute(
-            select(Conversation).where(Conversation.id == conversation_id)
+        # A single UPDATE; a missing conversation simply matches no row
+        await db.execute(
+            update(Conversation)
+            .where(Conversation.id == conversation_id)
+            .values(title=title)
         )
-        conversation = result.scalar_one_or_none()
-        if conversation:
-            conversation.title = title
-            await db.flush()
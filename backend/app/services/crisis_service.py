@@ -390,21 +390,25 @@ def _generate_response(self, severity: str) -> str:
         
         return "I'm here to listen and support you. How can I help?"
     
+    def build_crisis_event(self, user_id: int, conversation_id: int,
+                           message_id: int, assessment: Dict) -> CrisisEvent:
+        """Build an unsaved crisis event row, for callers batching it into their own flush."""
+        return CrisisEvent(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            message_id=message_id,
+            severity=assessment["severity"],
+            confidence=assessment["confidence"],
+            keywords_detected=json.dumps(assessment["keywords_found"]),
+            response_sent=assessment["response"][:500],  # Store first 500 chars
+            pattern_detected=assessment["pattern"]
+        )
+
     async def log_crisis_event(self, db: AsyncSession, user_id: int, conversation_id: int,
                                message_id: int, assessment: Dict) -> Optional[int]:
         """Store crisis assessment to database."""
         try:
-            event = CrisisEvent(
-                user_id=user_id,
-                conversation_id=conversation_id,
-                message_id=message_id,
-                severity=assessment["severity"],
-                confidence=assessment["confidence"],
-                keywords_detected=json.dumps(assessment["keywords_found"]),
-                response_sent=assessment["response"][:500],  # Store first 500 chars
-                pattern_detected=assessment["pattern"]
-            )
-            
+            event = self.build_crisis_event(user_id, conversation_id, message_id, assessment)
             db.add(event)
             await db.flush()
             event_id = event.id
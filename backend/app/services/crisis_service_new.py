@@ -1,3 +1,4 @@
+import json
 import logging
 from typing import Optional, List, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -84,6 +85,26 @@ async def assess_threat(
             'resources': []
         }
     
+    def build_crisis_event(
+        self,
+        user_id: int,
+        conversation_id: int,
+        message_id: int,
+        assessment: Dict
+    ) -> CrisisEvent:
+        """Build an unsaved crisis event row, for callers batching it into their own flush."""
+        keywords = assessment.get('keywords_found')
+        return CrisisEvent(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            message_id=message_id,
+            severity=assessment.get('severity'),
+            confidence=assessment.get('confidence', 0.0),
+            keywords_detected=json.dumps(keywords) if keywords else None,
+            response_sent=assessment.get('response'),
+            pattern_detected=assessment.get('pattern')
+        )
+    
     async def log_crisis_event(
         self,
         db: AsyncSession,
@@ -94,17 +115,7 @@ async def log_crisis_event(
     ) -> Optional[int]:
         """Log crisis event to database."""
         try:
-            crisis_event = CrisisEvent(
-                user_id=user_id,
-                conversation_id=conversation_id,
-                message_id=message_id,
-                severity=assessment.get('severity'),
-                confidence=assessment.get('confidence', 0.0),
-                keywords_detected=None,
-                response_sent=assessment.get('response'),
-                pattern_detected=None
-            )
-            
+            crisis_event = self.build_crisis_event(user_id, conversation_id, message_id, assessment)
             db.add(crisis_event)
             await db.flush()
             
@@ -1,6 +1,8 @@
 import logging
+import time
+from collections import OrderedDict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, case
 from datetime import datetime, timedelta
 from statistics import stdev
 from typing import List, Dict, Optional, Tuple
@@ -11,6 +13,19 @@
 
 logger = logging.getLogger(__name__)
 
+# Recently computed insights per user, keyed by window length. The chat path
+# and the insights endpoint ask for the same window several times a minute;
+# new crisis events drop the user's entries (see forget_user_insights).
+_INSIGHT_CACHE_TTL_SECONDS = 60
+_INSIGHT_CACHE_SIZE = 5000
+_insight_cache: "OrderedDict[int, Dict[int, Tuple[float, EmotionInsight]]]" = OrderedDict()
+
+
+def forget_user_insights(user_id: int) -> None:
+    """Drop cached insights for a user, e.g. after a crisis event is recorded."""
+    _insight_cache.pop(user_id, None)
+
+
 
 class EmotionAnalyticsService:
     """Aggregates emotion logs into structured insights. Non-LLM."""
@@ -42,28 +57,51 @@ async def generate_user_insights(
         days: int = 7
     ) -> EmotionInsight:
         """Generate complete emotional insight for user."""
+        cached = _insight_cache.get(user_id, {}).get(days)
+        if cached is not None and cached[0] > time.monotonic():
+            _insight_cache.move_to_end(user_id)
+            return cached[1]
+
+        insight = await self._compute_user_insights(db, user_id, days)
+        if insight is not None:
+            _insight_cache.setdefault(user_id, {})[days] = (
+                time.monotonic() + _INSIGHT_CACHE_TTL_SECONDS, insight
+            )
+            _insight_cache.move_to_end(user_id)
+            if len(_insight_cache) > _INSIGHT_CACHE_SIZE:
+                _insight_cache.popitem(last=False)
+            return insight
+        return self._default_insight(user_id, days, insufficient=True)
+    
+    async def _compute_user_insights(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        days: int
+    ) -> Optional[EmotionInsight]:
+        """Compute the insight from the database; None if that failed."""
         try:
-            logs = await self._get_recent_emotions(db, user_id, days)
+            buckets = await self._get_emotion_buckets(db, user_id, days)
+            log_count = sum(bucket["count"] for bucket in buckets)
             
-            if not logs or len(logs) < 3:
+            if log_count < 3:
                 return self._default_insight(user_id, days, insufficient=True)
             
-            distribution = self._compute_distribution(logs)
+            emotion_frequency = self._count_emotions(buckets)
+            distribution = self._compute_distribution(emotion_frequency)
             dominant = max(distribution, key=distribution.get)
             dominance_pct = distribution[dominant]
             
-            emotion_frequency = {}
             daily_breakdown = {}
-            for log in logs:
-                label = log["primary_emotion"]
-                emotion_frequency[label] = emotion_frequency.get(label, 0) + 1
-                day_key = str(log["created_date"]) if log["created_date"] else "unknown"
+            for bucket in buckets:
+                label = bucket["primary_emotion"]
+                day_key = str(bucket["created_date"]) if bucket["created_date"] else "unknown"
                 if day_key not in daily_breakdown:
                     daily_breakdown[day_key] = {}
-                daily_breakdown[day_key][label] = daily_breakdown[day_key].get(label, 0) + 1
+                daily_breakdown[day_key][label] = daily_breakdown[day_key].get(label, 0) + bucket["count"]
             
-            trend, trend_desc = self._detect_trend(logs)
-            volatility = self._compute_volatility(logs)
+            trend, trend_desc = self._detect_trend(buckets)
+            volatility = sum(bucket["shifts"] for bucket in buckets) / log_count
             sustained_sadness = distribution.get("sadness", 0) >= 0.60
             
             high_risk, crisis_count = await self._assess_risk(
@@ -74,13 +112,12 @@ async def generate_user_insights(
             suggested_approach = self.EMOTION_TONE_MAP.get(dominant, {}).get("approach", "exploration")
             avoid = self.TRIGGER_WARNINGS.get(dominant, [])
             
-            confidences = [log["confidence"] for log in logs]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.5
+            avg_confidence = sum(bucket["confidence_sum"] for bucket in buckets) / log_count
             
             return EmotionInsight(
                 user_id=user_id,
                 period_days=days,
-                log_count=len(logs),
+                log_count=log_count,
                 insufficient_data=False,
                 dominant_emotion=dominant,
                 dominance_pct=dominance_pct,
@@ -102,51 +139,74 @@ async def generate_user_insights(
         
         except Exception as e:
             logger.error(f"Analytics failed for user {user_id}: {str(e)}")
-            return self._default_insight(user_id, days, insufficient=True)
+            return None
     
-    async def _get_recent_emotions(
+    async def _get_emotion_buckets(
         self,
         db: AsyncSession,
         user_id: int,
         days: int
     ) -> List[Dict]:
-        """Fetch emotion logs for time window."""
-        try:
-            cutoff = datetime.utcnow() - timedelta(days=days)
-            
-            query = select(
-                EmotionLog.id,
-                EmotionLog.primary_emotion,
-                EmotionLog.confidence,
-                EmotionLog.created_at,
-                func.date(EmotionLog.created_at).label("created_date")
-            ).where(
-                EmotionLog.user_id == user_id,
-                EmotionLog.created_at >= cutoff
-            ).order_by(EmotionLog.created_at.asc())
-            
-            result = await db.execute(query)
-            return [
-                {
-                    "id": row[0],
-                    "primary_emotion": row[1],
-                    "confidence": row[2],
-                    "created_at": row[3],
-                    "created_date": row[4]
-                }
-                for row in result.all()
-            ]
-        except Exception as e:
-            logger.error(f"Failed to fetch emotions: {str(e)}")
-            return []
+        """
+        Aggregate the window's emotion logs per (emotion, day, half of the
+        window) in the database, so only O(emotions x days) rows come back.
+        
+        Each bucket also carries how many of its logs differ from the log
+        before them (for volatility) and the sum of their confidences.
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        ordering = (EmotionLog.created_at, EmotionLog.id)
+        
+        logs = select(
+            EmotionLog.primary_emotion,
+            EmotionLog.confidence,
+            func.date(EmotionLog.created_at).label("created_date"),
+            func.row_number().over(order_by=ordering).label("position"),
+            func.count().over().label("total"),
+            func.lag(EmotionLog.primary_emotion).over(order_by=ordering).label("previous_emotion"),
+        ).where(
+            EmotionLog.user_id == user_id,
+            EmotionLog.created_at >= cutoff
+        ).subquery()
+        
+        # First half is logs[:len // 2] in time order
+        first_half = (logs.c.position * 2 <= logs.c.total).label("first_half")
+        shifted = case((logs.c.previous_emotion != logs.c.primary_emotion, 1), else_=0)
+        
+        query = select(
+            logs.c.primary_emotion,
+            logs.c.created_date,
+            first_half,
+            func.count().label("count"),
+            func.coalesce(func.sum(logs.c.confidence), 0.0).label("confidence_sum"),
+            func.sum(shifted).label("shifts"),
+        ).group_by(
+            logs.c.primary_emotion, logs.c.created_date, first_half
+        ).order_by(logs.c.created_date)
+        
+        result = await db.execute(query)
+        return [
+            {
+                "primary_emotion": row.primary_emotion,
+                "created_date": row.created_date,
+                "first_half": bool(row.first_half),
+                "count": row.count,
+                "confidence_sum": float(row.confidence_sum),
+                "shifts": int(row.shifts or 0),
+            }
+            for row in result.all()
+        ]
     
-    def _compute_distribution(self, logs: List[Dict]) -> Dict[str, float]:
-        """Calculate emotion frequency distribution."""
+    def _count_emotions(self, buckets: List[Dict]) -> Dict[str, int]:
+        """Sum bucket counts per emotion."""
         counts = {}
-        for log in logs:
-            emotion = log["primary_emotion"]
-            counts[emotion] = counts.get(emotion, 0) + 1
-        
+        for bucket in buckets:
+            emotion = bucket["primary_emotion"]
+            counts[emotion] = counts.get(emotion, 0) + bucket["count"]
+        return counts
+    
+    def _compute_distribution(self, counts: Dict[str, int]) -> Dict[str, float]:
+        """Calculate emotion frequency distribution."""
         total = sum(counts.values())
         all_emotions = ["sadness", "joy", "anger", "fear", "neutral", "surprise", "disgust"]
         
@@ -155,17 +215,16 @@ def _compute_distribution(self, logs: List[Dict]) -> Dict[str, float]:
             for emotion in all_emotions
         }
     
-    def _detect_trend(self, logs: List[Dict]) -> Tuple[str, str]:
+    def _detect_trend(self, buckets: List[Dict]) -> Tuple[str, str]:
         """Detect emotion trend over time."""
-        if len(logs) < 3:
+        if sum(bucket["count"] for bucket in buckets) < 3:
             return "unknown", "Insufficient data for trend"
         
-        mid = len(logs) // 2
-        first_half = logs[:mid]
-        second_half = logs[mid:]
+        first_half = [bucket for bucket in buckets if bucket["first_half"]]
+        second_half = [bucket for bucket in buckets if not bucket["first_half"]]
         
-        first_dist = self._compute_distribution(first_half)
-        second_dist = self._compute_distribution(second_half)
+        first_dist = self._compute_distribution(self._count_emotions(first_half))
+        second_dist = self._compute_distribution(self._count_emotions(second_half))
         
         first_dominant = max(first_dist, key=first_dist.get)
         second_dominant = max(second_dist, key=second_dist.get)
@@ -175,16 +234,6 @@ def _detect_trend(self, logs: List[Dict]) -> Tuple[str, str]:
         else:
             return "changing", f"Shifted from {first_dominant} to {second_dominant}"
     
-    def _compute_volatility(self, logs: List[Dict]) -> float:
-        """Calculate emotion shift volatility rather than confidence variance."""
-        if len(logs) < 2:
-            return 0.0
-        shifts = 0
-        for i in range(1, len(logs)):
-            if logs[i]["primary_emotion"] != logs[i-1]["primary_emotion"]:
-                shifts += 1
-        return shifts / len(logs)
-    
     async def _assess_risk(
         self,
         db: AsyncSession,
@@ -193,28 +242,23 @@ async def _assess_risk(
         distribution: Dict[str, float]
     ) -> Tuple[bool, int]:
         """Check for risk patterns in last 48h."""
-        try:
-            cutoff = datetime.utcnow() - timedelta(hours=48)
-            query = select(func.count(CrisisEvent.id)).where(
-                CrisisEvent.user_id == user_id,
-                CrisisEvent.created_at >= cutoff
-            )
-            result = await db.execute(query)
-            crisis_count = result.scalar() or 0
-            
-            high_risk = (
-                crisis_count >= 1 or
-                distribution.get("crisis", 0) > 0 or
-                (crisis_count >= 2 and
-                (distribution.get("sadness", 0) > 0.50 or 
-                 distribution.get("anger", 0) > 0.40))
-            )
-            
-            return high_risk, crisis_count
+        cutoff = datetime.utcnow() - timedelta(hours=48)
+        query = select(func.count(CrisisEvent.id)).where(
+            CrisisEvent.user_id == user_id,
+            CrisisEvent.created_at >= cutoff
+        )
+        result = await db.execute(query)
+        crisis_count = result.scalar() or 0
         
-        except Exception as e:
-            logger.error(f"Risk assessment failed: {str(e)}")
-            return False, 0
+        high_risk = (
+            crisis_count >= 1 or
+            distribution.get("crisis", 0) > 0 or
+            (crisis_count >= 2 and
+            (distribution.get("sadness", 0) > 0.50 or 
+             distribution.get("anger", 0) > 0.40))
+        )
+        
+        return high_risk, crisis_count
     
     def _default_insight(
         self,
@@ -1,4 +1,5 @@
 import logging
+import re
 from typing import Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -10,6 +11,24 @@
 
 logger = logging.getLogger(__name__)
 
+# Only actual crisis keywords related to self-harm or suicide
+CRISIS_SIGNAL_KEYWORDS = (
+    "hurt myself",
+    "cut myself",
+    "kill myself",
+    "suicide",
+    "suicidal",
+    "end it all",
+    "overdose",
+    "not worth living",
+    "better off dead",
+    "want to die",
+    "don't want to live",
+    "harm myself",
+)
+# One pass over the message instead of one substring scan per keyword
+CRISIS_SIGNAL_PATTERN = re.compile("|".join(map(re.escape, CRISIS_SIGNAL_KEYWORDS)))
+
 
 class EmotionService:
     """Detects emotion from text and logs to database."""
@@ -34,6 +53,26 @@ async def detect_emotion(self, text: str) -> Dict[str, any]:
                 logger.error(f"Fallback emotion detection failed: {fallback_e}")
                 raise RuntimeError("All emotion engines failed") from fallback_e
     
+    def build_emotion_log(
+        self,
+        user_id: int,
+        conversation_id: int,
+        message_id: int,
+        label: str,
+        confidence: float
+    ) -> EmotionLog:
+        """Build an unsaved emotion log row, for callers batching it into their own flush."""
+        return EmotionLog(
+            user_id=user_id,
+            conversation_id=conversation_id,
+            message_id=message_id,
+            primary_emotion=normalize_emotion(label),
+            confidence=confidence,
+            intensity=None,  # Future intensity calculation
+            tags=None,
+            notes=None
+        )
+
     async def log_emotion(
         self,
         db: AsyncSession,
@@ -45,17 +84,8 @@ async def log_emotion(
     ) -> Optional[int]:
         """Log emotion."""
         try:
-            normalized_label = normalize_emotion(label)
-            # Create ORM object
-            emotion_log = EmotionLog(
-                user_id=user_id,
-                conversation_id=conversation_id,
-                message_id=message_id,
-                primary_emotion=normalized_label,
-                confidence=confidence,
-                intensity=None,  # Future intensity calculation
-                tags=None,
-                notes=None
+            emotion_log = self.build_emotion_log(
+                user_id, conversation_id, message_id, label, confidence
             )
             
             # Add to session
@@ -76,21 +106,4 @@ async def log_emotion(
     
     async def detect_crisis_signals(self, message: str) -> bool:
         """Detect crisis signals - only for actual harm indicators, not sadness."""
-        # Only detect actual crisis keywords related to self-harm or suicide
-        crisis_keywords = [
-            "hurt myself",
-            "cut myself",
-            "kill myself",
-            "suicide",
-            "suicidal",
-            "end it all",
-            "overdose",
-            "not worth living",
-            "better off dead",
-            "want to die",
-            "don't want to live",
-            "harm myself"
-        ]
-        
-        message_lower = message.lower()
-        return any(keyword in message_lower for keyword in crisis_keywords)
+        return CRISIS_SIGNAL_PATTERN.search(message.lower()) is not None
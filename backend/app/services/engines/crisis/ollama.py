@@ -1,8 +1,8 @@
 import logging
-import httpx
 from typing import Dict, Optional, List
 from app.services.engines.base import CrisisEngine
 from app.core.config import settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -134,10 +134,10 @@ async def assess(
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.endpoint, json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client()
+            response = await client.post(self.endpoint, json=payload, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
 
             raw = data["choices"][0]["message"]["content"].strip()
             severity = self._parse_severity(raw)
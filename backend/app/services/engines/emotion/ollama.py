@@ -1,8 +1,8 @@
 import logging
-import httpx
 from typing import Dict
 from app.services.engines.base import EmotionEngine
 from app.core.config import settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -58,10 +58,10 @@ async def analyze(self, text: str) -> Dict:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.endpoint, json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client()
+            response = await client.post(self.endpoint, json=payload, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
 
             raw = data["choices"][0]["message"]["content"].strip()
             label = self._parse_emotion(raw)
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from typing import List, Optional
@@ -141,9 +142,12 @@ async def init_engines():
     logger.info("Initializing AI engines...")
 
     provider = os.getenv('LLM_PROVIDER', 'gemini')
-    llm_engine = await EngineFactory.get_llm_engine_with_fallback(provider)
-    emotion_engine = await EngineFactory.get_emotion_engine_with_fallback(provider)
-    crisis_engine = await EngineFactory.get_crisis_engine_with_fallback('keywords')
+    # The three chains are independent, so resolve them concurrently.
+    llm_engine, emotion_engine, crisis_engine = await asyncio.gather(
+        EngineFactory.get_llm_engine_with_fallback(provider),
+        EngineFactory.get_emotion_engine_with_fallback(provider),
+        EngineFactory.get_crisis_engine_with_fallback('keywords'),
+    )
 
     logger.info("✓ All engines initialized successfully")
 
@@ -4,6 +4,7 @@
 from typing import Dict, List
 from app.services.engines.base import LLMEngine
 from app.core.config import settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -68,21 +69,22 @@ async def generate(
         logger.info(f"[{self.provider.upper()}] REQUEST model={self.model} max_tokens={max_tok} temp={temp} messages={len(full_messages)}")
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.endpoint,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                choice = data['choices'][0]
-                finish_reason = choice.get('finish_reason', 'unknown')
-                if finish_reason == 'length':
-                    logger.warning(f"[TOKEN_LIMIT] Response stopped at max_tokens ({payload['max_tokens']}). Output was truncated.")
-                content = choice['message']['content'].strip()
-                logger.info(f"[RESPONSE_LEN] {len(content)} chars, finish_reason={finish_reason}")
-                return content
+            client = get_http_client()
+            response = await client.post(
+                self.endpoint,
+                json=payload,
+                headers=headers,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+            choice = data['choices'][0]
+            finish_reason = choice.get('finish_reason', 'unknown')
+            if finish_reason == 'length':
+                logger.warning(f"[TOKEN_LIMIT] Response stopped at max_tokens ({payload['max_tokens']}). Output was truncated.")
+            content = choice['message']['content'].strip()
+            logger.info(f"[RESPONSE_LEN] {len(content)} chars, finish_reason={finish_reason}")
+            return content
         except httpx.HTTPStatusError as e:
             logger.error(f"LLM API error: {e.response.status_code} - {e.response.text}")
             raise RuntimeError(f"LLM API failed: {e.response.status_code}")
@@ -121,21 +123,21 @@ async def generate_stream(self, system_prompt: str, messages: List[Dict[str, str
         timeout = httpx.Timeout(connect=10.0, read=120.0, write=10.0, pool=5.0)
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                async with client.stream("POST", self.endpoint, json=payload, headers=headers) as response:
-                    response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if not line or line == "data: [DONE]":
-                            continue
-                        if not line.startswith("data: "):
-                            continue
-                        try:
-                            chunk = json.loads(line[6:])
-                            token = chunk["choices"][0]["delta"].get("content", "")
-                            if token:
-                                yield token
-                        except (json.JSONDecodeError, KeyError, IndexError):
-                            continue
+            client = get_http_client()
+            async with client.stream("POST", self.endpoint, json=payload, headers=headers, timeout=timeout) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line or line == "data: [DONE]":
+                        continue
+                    if not line.startswith("data: "):
+                        continue
+                    try:
+                        chunk = json.loads(line[6:])
+                        token = chunk["choices"][0]["delta"].get("content", "")
+                        if token:
+                            yield token
+                    except (json.JSONDecodeError, KeyError, IndexError):
+                        continue
         except httpx.HTTPStatusError as e:
             logger.error(f"LLM streaming API error: {e.response.status_code} - {e.response.text}")
             raise RuntimeError(f"LLM streaming API failed: {e.response.status_code}")
@@ -168,10 +170,10 @@ async def generate_title(self, text: str) -> str:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.endpoint, json=payload, headers=headers)
-                response.raise_for_status()
-                data = response.json()
+            client = get_http_client()
+            response = await client.post(self.endpoint, json=payload, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
         except Exception as e:
             logger.error(f"Title generation API call failed: {e}")
             data = {}
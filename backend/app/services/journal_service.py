@@ -8,6 +8,7 @@
 
 import logging
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional, List, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
@@ -223,10 +224,18 @@ def normalize_emotion_label(self, label: Optional[str]) -> str:
         """
         if not label:
             return "neutral"
-        normalized = str(label).strip().lower()
-        if normalized in self.MOOD_MAP:
+        # Stored labels are already canonical: one dict probe, no cache call
+        if label in self.MOOD_MAP:
+            return label
+        return self._normalized_label(str(label))
+
+    @classmethod
+    @lru_cache(maxsize=256)
+    def _normalized_label(cls, label: str) -> str:
+        normalized = label.strip().lower()
+        if normalized in cls.MOOD_MAP:
             return normalized
-        return self.EMOTION_NORMALIZATION.get(normalized, "neutral")
+        return cls.EMOTION_NORMALIZATION.get(normalized, "neutral")
     
     async def create_or_update_entry(
         self,
@@ -5,10 +5,16 @@
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import select, update, desc
+import numpy as np
+from sqlalchemy import select, update, desc, func, cast
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, load_only
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from pgvector.sqlalchemy import HALFVEC
 
 from app.models.memory import (
+    SEMANTIC_EMBEDDING_DIM,
     ConversationContextCache,
     SemanticMemory,
     EmotionalProfile as EmotionalProfileModel,
@@ -42,6 +48,7 @@ class MemoryService:
     """
 
     SEMANTIC_LIMIT = 3
+    HNSW_SEARCH_FACTOR = 8
     PROFILE_TTL = timedelta(hours=12)
     REFLECTION_TTL = timedelta(days=2)
 
@@ -88,12 +95,7 @@ async def build_memory_bundle(
             db=db, user_id=user_id, profile=emotional_profile
         )
 
-        return MemoryBundle(
-            short_term=ShortTermContext(summary=summary, recent_messages=trimmed_history),
-            semantic_memories=semantic,
-            emotional_profile=emotional_profile,
-            meta_reflection=meta_reflection,
-        )
+        return self._assemble_bundle(summary, trimmed_history, semantic, emotional_profile, meta_reflection)
 
     async def _build_memory_bundle_budgeted(
         self,
@@ -164,12 +166,7 @@ async def _build_memory_bundle_budgeted(
             context_refresh_service.queue_depth() if settings.feature_async_context_refresh else 0,
         )
 
-        return MemoryBundle(
-            short_term=ShortTermContext(summary=summary, recent_messages=trimmed_history),
-            semantic_memories=semantic,
-            emotional_profile=emotional_profile,
-            meta_reflection=meta_reflection,
-        )
+        return self._assemble_bundle(summary, trimmed_history, semantic, emotional_profile, meta_reflection)
 
     async def maybe_store_semantic_memory(
         self,
@@ -196,6 +193,7 @@ async def maybe_store_semantic_memory(
             conversation_id=conversation_id,
             content=message_text,
             embedding=embedding,
+            embedding_vector=embedding if self._uses_vector_search(db, embedding) else None,
             emotion_label=emotion_label,
             importance_score=score,
             source=source,
@@ -232,6 +230,24 @@ async def _upsert_context_cache(
             db.add(cache)
         await db.flush()
 
+    @staticmethod
+    def _assemble_bundle(
+        summary: Optional[str],
+        recent_messages: List[dict],
+        semantic: List[SemanticMemorySnippet],
+        emotional_profile: Optional[EmotionalProfileSummary],
+        meta_reflection: Optional[MetaReflectionSummary],
+    ) -> MemoryBundle:
+        # Every part is either a model built by this service or the
+        # transcript already in memory; validating would only copy each
+        # message dict again on every chat turn.
+        return MemoryBundle.model_construct(
+            short_term=ShortTermContext.model_construct(summary=summary, recent_messages=recent_messages),
+            semantic_memories=semantic,
+            emotional_profile=emotional_profile,
+            meta_reflection=meta_reflection,
+        )
+
     def _extract_summary(self, history: List[dict]):
         summary = None
         trimmed = []
@@ -257,21 +273,13 @@ async def _retrieve_semantic_memories(
         if not reference_embedding:
             return []
 
-        result = await db.execute(
-            select(SemanticMemory)
-                .where(SemanticMemory.user_id == user_id)
-                .order_by(desc(SemanticMemory.importance_score))
-                .limit(max(5, settings.memory_tier2_candidate_limit))
+        candidates = await self._load_semantic_candidates(
+            db=db, user_id=user_id, reference_embedding=reference_embedding
         )
-        candidates = result.scalars().all()
 
         if not settings.feature_semantic_blended_retrieval:
             scored = []
-            for memory in candidates:
-                try:
-                    similarity = self._cosine_similarity(reference_embedding, memory.embedding)
-                except Exception:
-                    similarity = 0.0
+            for memory, similarity in candidates:
                 if similarity <= 0:
                     continue
                 scored.append(
@@ -309,11 +317,7 @@ async def _retrieve_semantic_memories(
 
         recent_scored: List[Tuple[float, SemanticMemorySnippet]] = []
         stable_scored: List[Tuple[float, SemanticMemorySnippet]] = []
-        for memory in candidates:
-            try:
-                similarity = self._cosine_similarity(reference_embedding, memory.embedding)
-            except Exception:
-                similarity = 0.0
+        for memory, similarity in candidates:
             if similarity <= 0:
                 continue
 
@@ -344,6 +348,80 @@ async def _retrieve_semantic_memories(
         )
         return mixed
 
+    async def _load_semantic_candidates(
+        self,
+        *,
+        db: AsyncSession,
+        user_id: int,
+        reference_embedding: List[float],
+    ) -> List[Tuple[SemanticMemory, float]]:
+        """
+        Return candidate memories paired with their cosine similarity.
+
+        On PostgreSQL the nearest neighbours come straight from the pgvector
+        HNSW index; elsewhere we scan the most important memories in Python.
+        """
+        limit = max(5, settings.memory_tier2_candidate_limit)
+
+        if self._uses_vector_search(db, reference_embedding):
+            # The HNSW scan yields at most ef_search rows before the user_id
+            # filter is applied, so widen it (for this transaction only) well
+            # past the candidate limit to keep per-user recall intact.
+            await db.execute(
+                select(
+                    func.set_config(
+                        "hnsw.ef_search",
+                        str(min(1000, limit * self.HNSW_SEARCH_FACTOR)),
+                        True,
+                    )
+                )
+            )
+            # Ranked in half precision to match the halfvec HNSW index, which
+            # is half the size of a full-precision one; similarity error is
+            # ~1e-3 on normalised embeddings.
+            distance = cast(
+                SemanticMemory.embedding_vector, HALFVEC(SEMANTIC_EMBEDDING_DIM)
+            ).cosine_distance(reference_embedding)
+            result = await db.execute(
+                select(SemanticMemory, distance.label("distance"))
+                .options(
+                    defer(SemanticMemory.embedding),
+                    defer(SemanticMemory.embedding_vector),
+                )
+                .where(
+                    SemanticMemory.user_id == user_id,
+                    SemanticMemory.embedding_vector.isnot(None),
+                )
+                .order_by(distance)
+                .limit(limit)
+            )
+            return [
+                (memory, min(1.0, max(0.0, 1.0 - float(dist))))
+                for memory, dist in result.all()
+            ]
+
+        result = await db.execute(
+            select(SemanticMemory)
+                .where(SemanticMemory.user_id == user_id)
+                .order_by(desc(SemanticMemory.importance_score))
+                .limit(limit)
+        )
+        memories = result.scalars().all()
+        similarities = self._batch_cosine_similarity(
+            reference_embedding, [memory.embedding for memory in memories]
+        )
+        return list(zip(memories, similarities))
+
+    def _dialect_name(self, db: AsyncSession) -> Optional[str]:
+        bind = getattr(db, "bind", None)
+        return bind.dialect.name if bind is not None else None
+
+    def _uses_vector_search(self, db: AsyncSession, embedding: List[float]) -> bool:
+        return (
+            self._dialect_name(db) == "postgresql"
+            and len(embedding) == SEMANTIC_EMBEDDING_DIM
+        )
+
     async def _determine_channel_weights(
         self, *, db: AsyncSession, user_id: int
     ) -> Tuple[float, float, float]:
@@ -437,7 +515,7 @@ async def _get_or_compute_profile(
         insight = await self.analytics_service.generate_user_insights(
             db=db, user_id=user_id, days=30
         )
-        profile_data = EmotionalProfileModel(
+        values = dict(
             user_id=user_id,
             period_days=insight.period_days,
             window_start=(now - timedelta(days=insight.period_days)).replace(tzinfo=timezone.utc),
@@ -452,24 +530,24 @@ async def _get_or_compute_profile(
             log_count=insight.log_count,
             emotion_distribution=insight.emotion_distribution,
             trend=insight.trend,
+            computed_at=datetime.now(timezone.utc),
+        )
+        # One atomic INSERT ... ON CONFLICT per (user, window) instead of
+        # update-or-add, so concurrent recomputes cannot insert duplicates.
+        # populate_existing refreshes profile_row if it is the row updated.
+        dialect_insert = pg_insert if self._dialect_name(db) == "postgresql" else sqlite_insert
+        insert_stmt = dialect_insert(EmotionalProfileModel).values(**values)
+        upsert = insert_stmt.on_conflict_do_update(
+            index_elements=["user_id", "period_days"],
+            set_={
+                key: insert_stmt.excluded[key]
+                for key in values
+                if key not in ("user_id", "period_days")
+            },
+        ).returning(EmotionalProfileModel)
+        profile_data = await db.scalar(
+            upsert, execution_options={"populate_existing": True}
         )
-        if profile_row:
-            profile_row.dominant_emotion = profile_data.dominant_emotion
-            profile_row.dominance_pct = profile_data.dominance_pct
-            profile_row.anxiety_score = profile_data.anxiety_score
-            profile_row.sadness_score = profile_data.sadness_score
-            profile_row.resilience_score = profile_data.resilience_score
-            profile_row.volatility_index = profile_data.volatility_index
-            profile_row.log_count = profile_data.log_count
-            profile_row.emotion_distribution = profile_data.emotion_distribution
-            profile_row.trend = profile_data.trend
-            profile_row.window_start = profile_data.window_start
-            profile_row.window_end = profile_data.window_end
-            profile_row.computed_at = datetime.now(timezone.utc)
-        else:
-            db.add(profile_data)
-            profile_data.computed_at = datetime.now(timezone.utc)
-        await db.flush()
 
         return EmotionalProfileSummary(
             dominant_emotion=profile_data.dominant_emotion,
@@ -583,8 +661,10 @@ async def _synthesise_reflection(
         user_id: int,
         profile: Optional[EmotionalProfileSummary],
     ) -> MetaReflectionSummary:
+        # Only the tags are summarised; leave the entry text in the database
         journal_q = await db.execute(
             select(JournalEntry)
+            .options(load_only(JournalEntry.tags))
             .where(JournalEntry.user_id == user_id)
             .order_by(desc(JournalEntry.created_at))
             .limit(5)
@@ -629,14 +709,28 @@ def _score_importance(self, text: str, emotion_label: Optional[str]) -> float:
             score += 0.4
         return min(score, 1.0)
 
-    def _cosine_similarity(self, a: List[float], b: List[float]) -> float:
-        if not a or not b or len(a) != len(b):
-            return 0.0
-        dot = sum(x * y for x, y in zip(a, b))
-        norm_a = sum(x * x for x in a) ** 0.5 or 1.0
-        norm_b = sum(x * x for x in b) ** 0.5 or 1.0
+    def _batch_cosine_similarity(
+        self, reference: List[float], embeddings: List[List[float]]
+    ) -> List[float]:
+        """Score every embedding against the reference in one vectorised pass."""
+        scores = [0.0] * len(embeddings)
+        rows = [
+            idx
+            for idx, embedding in enumerate(embeddings)
+            if isinstance(embedding, list) and embedding and len(embedding) == len(reference)
+        ]
+        if not reference or not rows:
+            return scores
+
+        matrix = np.asarray([embeddings[idx] for idx in rows], dtype=np.float32)
+        ref = np.asarray(reference, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (float(np.linalg.norm(ref)) or 1.0)
+        norms[norms == 0] = 1.0
         # Clamp to [0, 1] to handle floating-point precision issues
-        return min(1.0, max(0.0, dot / (norm_a * norm_b)))
+        similarities = np.clip((matrix @ ref) / norms, 0.0, 1.0)
+        for idx, similarity in zip(rows, similarities.tolist()):
+            scores[idx] = similarity
+        return scores
 
 
 memory_service = MemoryService()
@@ -2,10 +2,10 @@
 import os
 import random
 from typing import Optional, List, Dict, TypeAlias
-import httpx
 
 from app.schemas.emotion_insight import EmotionInsight
 from app.core.config import settings
+from app.core.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -117,38 +117,39 @@ async def _assess_response_length_needed(self, user_message: str) -> Assessment:
                 "temperature": 0.1  # Very low temp for consistent decisions
             }
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    self.endpoint,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                assessment = data["choices"][0]["message"]["content"].strip()
-                
-                logger.info(f"[RAW_ASSESSMENT] {assessment}")
-                
-                # Parse assessment
-                decision = "SHORT"  # Default
-                reason = "No assessment"
-                
-                if "LONG" in assessment.upper():
-                    decision = "LONG"
-                
-                # Extract reason if present
-                if "REASON:" in assessment:
-                    parts = assessment.split("REASON:")
-                    if len(parts) > 1:
-                        reason = parts[1].strip()
-                else:
-                    reason = assessment[:50]
-                
-                # Allocate token limit
-                max_tokens = 3000 if decision == "LONG" else 1000
-                
-                logger.info(f"[ASSESSMENT] Decision: {decision} | Max tokens: {max_tokens} | Reason: {reason}")
-                return max_tokens, reason
+            client = get_http_client()
+            response = await client.post(
+                self.endpoint,
+                json=payload,
+                headers=headers,
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            assessment = data["choices"][0]["message"]["content"].strip()
+            
+            logger.info(f"[RAW_ASSESSMENT] {assessment}")
+            
+            # Parse assessment
+            decision = "SHORT"  # Default
+            reason = "No assessment"
+            
+            if "LONG" in assessment.upper():
+                decision = "LONG"
+            
+            # Extract reason if present
+            if "REASON:" in assessment:
+                parts = assessment.split("REASON:")
+                if len(parts) > 1:
+                    reason = parts[1].strip()
+            else:
+                reason = assessment[:50]
+            
+            # Allocate token limit
+            max_tokens = 3000 if decision == "LONG" else 1000
+            
+            logger.info(f"[ASSESSMENT] Decision: {decision} | Max tokens: {max_tokens} | Reason: {reason}")
+            return max_tokens, reason
                 
         except Exception as e:
             logger.warning(f"Assessment failed: {str(e)}")
@@ -227,30 +228,31 @@ async def should_create_journal_entry_ai(
                 "temperature": 0.3,  # Low value for deterministic output
             }
             
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                response = await client.post(
-                    self.endpoint,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                raw_response = data["choices"][0]["message"]["content"].strip()
-                
-                logger.info(f"[JOURNAL_AI] Raw response: {raw_response[:100]}")
-                
-                # Parse JSON response
-                import json
-                ai_decision = json.loads(raw_response)
-                
-                logger.info(f"[JOURNAL_AI] Decision: extract={ai_decision.get('should_extract')}, confidence={ai_decision.get('confidence')}, reason={ai_decision.get('reason')}")
-                
-                return {
-                    "should_extract": ai_decision.get("should_extract", False),
-                    "confidence": float(ai_decision.get("confidence", 0.0)),
-                    "summary": ai_decision.get("summary", ""),
-                    "reason": ai_decision.get("reason", "AI assessment")
-                }
+            client = get_http_client()
+            response = await client.post(
+                self.endpoint,
+                json=payload,
+                headers=headers,
+                timeout=15.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            raw_response = data["choices"][0]["message"]["content"].strip()
+            
+            logger.info(f"[JOURNAL_AI] Raw response: {raw_response[:100]}")
+            
+            # Parse JSON response
+            import json
+            ai_decision = json.loads(raw_response)
+            
+            logger.info(f"[JOURNAL_AI] Decision: extract={ai_decision.get('should_extract')}, confidence={ai_decision.get('confidence')}, reason={ai_decision.get('reason')}")
+            
+            return {
+                "should_extract": ai_decision.get("should_extract", False),
+                "confidence": float(ai_decision.get("confidence", 0.0)),
+                "summary": ai_decision.get("summary", ""),
+                "reason": ai_decision.get("reason", "AI assessment")
+            }
                 
         except Exception as e:
             logger.warning(f"[JOURNAL_AI] Assessment failed (non-blocking): {type(e).__name__}: {str(e)}")
@@ -305,28 +307,29 @@ async def _call_gemini_api(
             payload["presence_penalty"] = 0.3
         
         # Initialize HTTP client
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            logger.info(f"POST to Gemini API: {self.endpoint}")
-            response = await client.post(
-                self.endpoint,
-                json=payload,
-                headers=headers
-            )
-            
-            logger.info(f"Response status: {response.status_code}")
-            response.raise_for_status()
-            
-            try:
-                data = response.json()
-                logger.info(f"Parsed JSON response")
-                content = data["choices"][0]["message"]["content"]
-                content = self._clean_response(content)
-                logger.info(f"Extracted content: {len(content)} chars")
-                return content
-            except (KeyError, IndexError, ValueError) as e:
-                logger.error(f"Failed to parse response: {type(e).__name__}: {str(e)}")
-                logger.error(f"Raw response: {response.text[:500]}")
-                raise
+        client = get_http_client()
+        logger.info(f"POST to Gemini API: {self.endpoint}")
+        response = await client.post(
+            self.endpoint,
+            json=payload,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        
+        logger.info(f"Response status: {response.status_code}")
+        response.raise_for_status()
+        
+        try:
+            data = response.json()
+            logger.info(f"Parsed JSON response")
+            content = data["choices"][0]["message"]["content"]
+            content = self._clean_response(content)
+            logger.info(f"Extracted content: {len(content)} chars")
+            return content
+        except (KeyError, IndexError, ValueError) as e:
+            logger.error(f"Failed to parse response: {type(e).__name__}: {str(e)}")
+            logger.error(f"Raw response: {response.text[:500]}")
+            raise
     
     def _build_system_prompt(
         self,
@@ -0,0 +1,154 @@
+"""
+In-process cache of chat replies, so a repeated or reworded message at the
+same point of a conversation can skip the LLM call.
+
+Two tiers: an exact-key tier for literal repeats, checked first and holding
+the detected emotion as well, and a semantic tier matched by embedding
+similarity.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+
+# (user_id, digest of the exchange being answered)
+CacheScope = Tuple[int, str]
+
+
+@dataclass
+class CachedReply:
+    vector: np.ndarray
+    reply: str
+    expires_at: float
+
+
+@dataclass
+class CachedTurn:
+    reply: str
+    emotion: Dict[str, Any]
+    expires_at: float
+
+
+class ResponseCache:
+    """Per-user reply cache matched by cosine similarity of the user message."""
+
+    def __init__(self) -> None:
+        self._scopes: "OrderedDict[CacheScope, List[CachedReply]]" = OrderedDict()
+        self._exact: "OrderedDict[str, CachedTurn]" = OrderedDict()
+
+        # Metrics
+        self._hits = 0
+        self._misses = 0
+        self._exact_hits = 0
+        self._exact_misses = 0
+
+    def is_eligible(self, history: List[dict], crisis_detected: bool) -> bool:
+        """Crisis turns and long conversations always go to the LLM."""
+        return (
+            settings.feature_response_cache
+            and not crisis_detected
+            and len(history) <= settings.response_cache_max_history
+        )
+
+    @staticmethod
+    def scope_for(user_id: int, history: List[dict]) -> CacheScope:
+        """Key replies to the user and the last exchange they respond to."""
+        digest = hashlib.blake2b(digest_size=16)
+        for message in history[-2:]:
+            digest.update(message.get("role", "").encode("utf-8") + b"\0")
+            digest.update(message.get("content", "").encode("utf-8") + b"\0")
+        return user_id, digest.hexdigest()
+
+    @classmethod
+    def exact_key(cls, user_id: int, history: List[dict], message: str, emotion_engine: str) -> str:
+        """Key for a literal repeat of message; the emotion engine is part of it
+        because cached turns carry its result."""
+        _, history_digest = cls.scope_for(user_id, history)
+        digest = hashlib.blake2b(digest_size=16)
+        for part in (str(user_id), history_digest, emotion_engine, message.strip()):
+            digest.update(part.encode("utf-8") + b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedTurn]:
+        turn = self._exact.get(key)
+        if turn is not None and turn.expires_at <= time.monotonic():
+            del self._exact[key]
+            turn = None
+        if turn is None:
+            self._exact_misses += 1
+            return None
+        self._exact.move_to_end(key)
+        self._exact_hits += 1
+        return turn
+
+    def set(self, key: str, reply: str, emotion: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        if not reply:
+            return
+        ttl = settings.response_cache_ttl_seconds if ttl is None else ttl
+        self._exact[key] = CachedTurn(reply=reply, emotion=dict(emotion), expires_at=time.monotonic() + ttl)
+        self._exact.move_to_end(key)
+        while len(self._exact) > settings.response_cache_max_exact_entries:
+            self._exact.popitem(last=False)
+
+    def lookup(self, scope: CacheScope, embedding: List[float]) -> Optional[str]:
+        """Return the cached reply closest to embedding, if similar enough."""
+        entries = self._scopes.get(scope)
+        if entries and embedding:
+            now = time.monotonic()
+            entries[:] = [entry for entry in entries if entry.expires_at > now]
+            query = self._normalise(embedding)
+            # Hash-fallback and model embeddings differ in size; never compare across.
+            candidates = [entry for entry in entries if entry.vector.shape == query.shape]
+            if candidates:
+                similarities = np.stack([entry.vector for entry in candidates]) @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= settings.response_cache_similarity_threshold:
+                    self._scopes.move_to_end(scope)
+                    self._hits += 1
+                    return candidates[best].reply
+
+        self._misses += 1
+        return None
+
+    def store(self, scope: CacheScope, embedding: List[float], reply: str) -> None:
+        if not embedding or not reply:
+            return
+        entries = self._scopes.setdefault(scope, [])
+        entries.append(
+            CachedReply(
+                vector=self._normalise(embedding),
+                reply=reply,
+                expires_at=time.monotonic() + settings.response_cache_ttl_seconds,
+            )
+        )
+        del entries[:-settings.response_cache_entries_per_scope]
+        self._scopes.move_to_end(scope)
+        while len(self._scopes) > settings.response_cache_max_scopes:
+            self._scopes.popitem(last=False)
+
+    def metrics(self) -> Dict[str, float]:
+        lookups = self._hits + self._misses
+        exact_lookups = self._exact_hits + self._exact_misses
+        return {
+            "scopes": float(len(self._scopes)),
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "exact_entries": float(len(self._exact)),
+            "exact_hit_rate": self._exact_hits / exact_lookups if exact_lookups else 0.0,
+        }
+
+    @staticmethod
+    def _normalise(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,44 @@
+"""
+arq worker for post-response jobs queued by the chat router.
+
+Run with ``arq app.worker.WorkerSettings``; it reads the same settings as the
+API, including task_queue_redis_url.
+"""
+
+import logging
+
+from arq.connections import RedisSettings
+
+from app.core.config import settings
+from app.core.http_client import close_http_client
+from app.db.session import engine
+import app.main as main_app
+from app.routers.chat import generate_title_async, post_process_chat_async
+
+logger = logging.getLogger(__name__)
+
+
+async def post_process_chat(ctx, **kwargs) -> None:
+    await post_process_chat_async(**kwargs)
+
+
+async def generate_title(ctx, **kwargs) -> None:
+    await generate_title_async(**kwargs)
+
+
+async def startup(ctx) -> None:
+    # Jobs call the LLM and emotion services through app.main's globals
+    await main_app.init_services()
+    logger.info("✓ Task worker ready")
+
+
+async def shutdown(ctx) -> None:
+    await close_http_client()
+    await engine.dispose()
+
+
+class WorkerSettings:
+    functions = [post_process_chat, generate_title]
+    on_startup = startup
+    on_shutdown = shutdown
+    redis_settings = RedisSettings.from_dsn(settings.task_queue_redis_url or "redis://localhost:6379")
@@ -1,4 +1,6 @@
 import asyncio
+import os
+import tempfile
 import unittest
 from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
@@ -6,12 +8,24 @@
 from unittest.mock import AsyncMock
 from sqlalchemy.ext.asyncio import AsyncSession
 
+# app.db.session builds its engines at import time and needs a URL; the tests
+# never connect through them, so a throwaway SQLite file is enough.
+os.environ.setdefault(
+    "DATABASE_URL",
+    f"sqlite+aiosqlite:///{os.path.join(tempfile.gettempdir(), 'serenity-tests.db')}",
+)
+
 from app.core.config import settings
 from app.schemas.memory import SemanticMemorySnippet
+from app.models.message import MessageRole
+from app.services.context_manager import ContextManager, forget_conversation
 from app.services.context_refresh_service import ContextRefreshService
+from app.services.emotion_analytics_service import EmotionAnalyticsService, _insight_cache
+from app.services.conversation_service import ConversationService, forget_conversation_owner
 from app.services.goal_service import GoalService
 from app.services.journal_service import JournalService
 from app.services.memory_service import MemoryService
+from app.services.response_cache import ResponseCache
 
 
 class _FakeResult:
@@ -30,6 +44,21 @@ async def execute(self, _):
         return _FakeResult(self.rows)
 
 
+class _FakeMessagesDB:
+    """Returns the rows newer than the message id the query filters on."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.after_ids = []
+
+    async def execute(self, statement):
+        after_id = next(
+            value for key, value in statement.compile().params.items() if key.startswith("id_")
+        )
+        self.after_ids.append(after_id)
+        return _FakeResult([row for row in self.rows if row.id > after_id])
+
+
 class MemoryServiceTests(unittest.IsolatedAsyncioTestCase):
     async def test_mixed_bucket_retrieval_interleaves_channels(self):
         service = MemoryService()
@@ -193,5 +222,311 @@ async def test_pressure_guardrail_and_prewarm_metrics(self):
         settings.memory_refresh_queue_max_depth = old_depth
 
 
+class ContextManagerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_transcript_cache_reads_only_the_tail(self):
+        manager = ContextManager()
+        forget_conversation(1)
+        table = [
+            SimpleNamespace(id=i, role=MessageRole.user, content=f"m{i}") for i in range(1, 13)
+        ]
+        db = _FakeMessagesDB(table)
+        history = await manager.get_optimized_history(cast(AsyncSession, db), 1)
+        self.assertEqual(db.after_ids, [0])
+
+        # Warm turn: only the last cached rows and anything newer are read
+        table.append(SimpleNamespace(id=13, role=MessageRole.user, content="m13"))
+        await manager.get_optimized_history(cast(AsyncSession, db), 1)
+        self.assertEqual(db.after_ids[-1], 4)
+
+        forget_conversation(1)
+        history = await manager.get_optimized_history(cast(AsyncSession, _FakeMessagesDB([])), 1)
+        self.assertEqual(history, [])
+
+    async def test_transcript_cache_picks_up_late_committed_lower_id(self):
+        manager = ContextManager()
+        forget_conversation(2)
+        # Row 2 was flushed by a concurrent turn but had not committed yet
+        table = [
+            SimpleNamespace(id=1, role=MessageRole.user, content="first"),
+            SimpleNamespace(id=3, role=MessageRole.user, content="third"),
+        ]
+        db = _FakeMessagesDB(table)
+        await manager.get_optimized_history(cast(AsyncSession, db), 2)
+
+        table.insert(1, SimpleNamespace(id=2, role=MessageRole.user, content="second"))
+        history = await manager.get_optimized_history(cast(AsyncSession, db), 2)
+        self.assertEqual([m["content"] for m in history], ["first", "second", "third"])
+        forget_conversation(2)
+
+
+class ConversationServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_ownership_is_cached_until_conversation_is_forgotten(self):
+        service = ConversationService()
+        forget_conversation_owner(7)
+        db = AsyncMock()
+        db.scalar.return_value = True
+
+        self.assertTrue(await service.validate_conversation_ownership(db, 1, 7))
+        self.assertTrue(await service.validate_conversation_ownership(db, 1, 7))
+        self.assertEqual(db.scalar.await_count, 1)
+
+        # Another user never gets the cached answer
+        db.scalar.return_value = False
+        self.assertFalse(await service.validate_conversation_ownership(db, 2, 7))
+        self.assertEqual(db.scalar.await_count, 2)
+
+        forget_conversation_owner(7)
+        self.assertFalse(await service.validate_conversation_ownership(db, 1, 7))
+        self.assertEqual(db.scalar.await_count, 3)
+
+
+class EmotionAnalyticsServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def test_failed_insight_query_is_not_cached(self):
+        service = EmotionAnalyticsService()
+        _insight_cache.pop(11, None)
+        db = AsyncMock()
+        db.execute.side_effect = RuntimeError("database unavailable")
+
+        insight = await service.generate_user_insights(cast(AsyncSession, db), 11)
+
+        self.assertTrue(insight.insufficient_data)
+        self.assertNotIn(11, _insight_cache)
+
+
+class _SQLiteAppTestCase(unittest.IsolatedAsyncioTestCase):
+    """Runs routers against a fresh in-memory SQLite schema with one user."""
+
+    async def asyncSetUp(self):
+        # Imported here: the routers pull in the app and its database settings
+        import app.main as main_app
+        from app.db.base import Base
+        from app.models.user import User
+        from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+        self.main_app = main_app
+        self.engine = create_async_engine("sqlite+aiosqlite://")
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+        async with self.session_factory() as db:
+            self.user = User(name="Test", username="test", email="t@example.com", hashed_password="x")
+            db.add(self.user)
+            await db.commit()
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+
+class ChatCrisisTests(_SQLiteAppTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        from app.services.crisis_service_new import CrisisService
+        from app.services.emotion_service import EmotionService
+
+        self.saved_services = (self.main_app.crisis_service, self.main_app.emotion_service)
+        self.main_app.crisis_service = CrisisService()
+        # Crisis turns only build log rows; no emotion engine is needed
+        self.main_app.emotion_service = EmotionService.__new__(EmotionService)
+
+    async def asyncTearDown(self):
+        self.main_app.crisis_service, self.main_app.emotion_service = self.saved_services
+        await super().asyncTearDown()
+
+    async def test_crisis_message_returns_resources_and_records_event(self):
+        from fastapi import BackgroundTasks
+        from sqlalchemy import select
+        from app.models.crisis_event import CrisisEvent
+        from app.models.message import Message
+        from app.routers.chat import chat_endpoint
+        from app.schemas.chat import ChatRequest
+
+        _insight_cache[self.user.id] = {7: (float("inf"), SimpleNamespace(high_risk=False))}
+        async with self.session_factory() as db:
+            # __wrapped__ skips the rate limiter, which needs a live request
+            response = await chat_endpoint.__wrapped__(
+                request=None,
+                body=ChatRequest(message="I want to die"),
+                background_tasks=BackgroundTasks(),
+                db=db,
+                current_user=self.user,
+            )
+
+        self.assertTrue(response.crisis_detected)
+        self.assertEqual(response.crisis_severity, "crisis")
+        self.assertIn("988", [resource.phone for resource in response.resources])
+
+        async with self.session_factory() as db:
+            events = (await db.execute(select(CrisisEvent))).scalars().all()
+            messages = (await db.execute(select(Message.id))).scalars().all()
+        self.assertEqual([event.severity for event in events], ["crisis"])
+        self.assertEqual(events[0].message_id, response.message_id)
+        self.assertEqual(messages, [response.message_id])
+        # The next turn must see the new event in its insight
+        self.assertNotIn(self.user.id, _insight_cache)
+
+    async def test_crisis_reply_survives_failure_to_record_event(self):
+        from fastapi import BackgroundTasks
+        from sqlalchemy import select
+        from app.models.message import Message
+        from app.routers.chat import chat_endpoint
+        from app.schemas.chat import ChatRequest
+
+        def fail(**_):
+            raise RuntimeError("crisis log unavailable")
+
+        self.main_app.crisis_service.build_crisis_event = fail
+        async with self.session_factory() as db:
+            response = await chat_endpoint.__wrapped__(
+                request=None,
+                body=ChatRequest(message="I want to die"),
+                background_tasks=BackgroundTasks(),
+                db=db,
+                current_user=self.user,
+            )
+
+        self.assertTrue(response.crisis_detected)
+        async with self.session_factory() as db:
+            messages = (await db.execute(select(Message.id))).scalars().all()
+        self.assertEqual(messages, [response.message_id])
+
+    async def test_message_to_conversation_deleted_elsewhere_is_not_found(self):
+        from fastapi import BackgroundTasks, HTTPException
+        from sqlalchemy import text
+        from app.routers.chat import chat_endpoint
+        from app.schemas.chat import ChatRequest
+        from app.services.conversation_service import _conversation_owners
+
+        # Ownership cached by this worker before another one deleted the row
+        conversation_service = ConversationService()
+        _conversation_owners[999] = (self.user.id, float("inf"))
+        self.assertTrue(await conversation_service.validate_conversation_ownership(
+            cast(AsyncSession, None), self.user.id, 999
+        ))
+        async with self.session_factory() as db:
+            await db.execute(text("PRAGMA foreign_keys=ON"))
+            with self.assertRaises(HTTPException) as raised:
+                await chat_endpoint.__wrapped__(
+                    request=None,
+                    body=ChatRequest(message="I want to die", conversation_id=999),
+                    background_tasks=BackgroundTasks(),
+                    db=db,
+                    current_user=self.user,
+                )
+
+        self.assertEqual(raised.exception.status_code, 404)
+        self.assertNotIn(999, _conversation_owners)
+
+    async def test_stream_crisis_message_sends_crisis_frames(self):
+        from fastapi import BackgroundTasks
+        from sqlalchemy import select
+        from app.models.crisis_event import CrisisEvent
+        from app.routers.chat import chat_stream_endpoint, log_crisis_emotion_async
+        from app.schemas.chat import ChatRequest
+
+        background_tasks = BackgroundTasks()
+        async with self.session_factory() as db:
+            response = await chat_stream_endpoint.__wrapped__(
+                request=None,
+                body=ChatRequest(message="I want to die"),
+                background_tasks=background_tasks,
+                db=db,
+                current_user=self.user,
+            )
+            frames = [frame async for frame in response.body_iterator]
+
+        self.assertEqual(frames[-1], "data: __CRISIS__crisis__2\n\n")
+        self.assertEqual([task.func for task in background_tasks.tasks], [log_crisis_emotion_async])
+        async with self.session_factory() as db:
+            events = (await db.execute(select(CrisisEvent.severity))).scalars().all()
+        self.assertEqual(events, ["crisis"])
+
+
+class ConversationDeleteTests(_SQLiteAppTestCase):
+    async def test_delete_removes_dependent_rows_without_cascades(self):
+        from sqlalchemy import select
+        from app.models.conversation import Conversation
+        from app.models.emotion_log import EmotionLog
+        from app.models.message import Message, MessageRole
+        from app.routers.conversations import delete_conversation
+
+        async with self.session_factory() as db:
+            conversation = Conversation(user_id=self.user.id)
+            db.add(conversation)
+            await db.flush()
+            message = Message(conversation_id=conversation.id, role=MessageRole.user, content="hi")
+            db.add(message)
+            await db.flush()
+            db.add(EmotionLog(
+                user_id=self.user.id, conversation_id=conversation.id,
+                message_id=message.id, primary_emotion="joy", confidence=0.9,
+            ))
+            await db.commit()
+
+            await delete_conversation(conversation.id, current_user=self.user, db=db)
+
+        async with self.session_factory() as db:
+            for model in (Conversation, Message, EmotionLog):
+                self.assertEqual((await db.execute(select(model.id))).all(), [])
+
+
+class TranscriptPlaceholderTests(_SQLiteAppTestCase):
+    async def test_streamed_placeholder_is_read_once_filled(self):
+        from app.models.conversation import Conversation
+        from app.models.message import Message
+        from app.services.conversation_service import ConversationService
+
+        service = ConversationService()
+        manager = ContextManager()
+        async with self.session_factory() as db:
+            conversation = Conversation(user_id=self.user.id)
+            db.add(conversation)
+            await db.flush()
+            forget_conversation(conversation.id)
+            await service.save_message(db, conversation.id, "user", "hi")
+            placeholder_id = await service.save_message(db, conversation.id, "assistant", "")
+            await db.commit()
+
+            # Read mid-stream, e.g. by another worker
+            history = await manager.get_optimized_history(db, conversation.id)
+            self.assertEqual([m["content"] for m in history], ["hi"])
+
+            await service.finalize_message(db, placeholder_id, "hello")
+            await db.commit()
+            history = await manager.get_optimized_history(db, conversation.id)
+            self.assertEqual([m["content"] for m in history], ["hi", "hello"])
+            forget_conversation(conversation.id)
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def test_similar_message_in_same_scope_hits(self):
+        cache = ResponseCache()
+        history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+        scope = cache.scope_for(1, history)
+        cache.store(scope, [1.0, 0.0, 0.0], "cached reply")
+
+        self.assertEqual(cache.lookup(scope, [0.99, 0.05, 0.0]), "cached reply")
+        self.assertIsNone(cache.lookup(scope, [0.0, 1.0, 0.0]))
+        # Other users and other points in the conversation never share replies
+        self.assertIsNone(cache.lookup(cache.scope_for(2, history), [1.0, 0.0, 0.0]))
+        self.assertIsNone(cache.lookup(cache.scope_for(1, history[:1]), [1.0, 0.0, 0.0]))
+        # Embeddings of another size (hash fallback) are not compared
+        self.assertIsNone(cache.lookup(scope, [1.0, 0.0]))
+        self.assertEqual(cache.metrics()["hit_rate"], 0.2)
+
+    def test_exact_tier_keys_on_history_and_emotion_engine(self):
+        cache = ResponseCache()
+        history = [{"role": "assistant", "content": "hello"}]
+        key = cache.exact_key(1, history, "thanks", "KeywordEmotionEngine")
+        cache.set(key, "any time", {"label": "joy", "confidence": 0.8})
+
+        turn = cache.get(cache.exact_key(1, history, " thanks ", "KeywordEmotionEngine"))
+        self.assertEqual((turn.reply, turn.emotion["label"]), ("any time", "joy"))
+        self.assertIsNone(cache.get(cache.exact_key(1, [], "thanks", "KeywordEmotionEngine")))
+        self.assertIsNone(cache.get(cache.exact_key(1, history, "thanks", "OllamaEmotionEngine")))
+
+        cache.set(key, "any time", {"label": "joy", "confidence": 0.8}, ttl=0)
+        self.assertIsNone(cache.get(key))
+
+
 if __name__ == "__main__":
     unittest.main()
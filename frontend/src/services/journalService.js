@@ -8,10 +8,12 @@ export const journalService = {
    * @param {number} skip - Offset
    * @param {number} limit - Count
    * @param {string} emotion - Filter
+   * @param {string} cursor - next_cursor of the previous page
    */
-  async listEntries(skip = 0, limit = 10, emotion = null) {
+  async listEntries(skip = 0, limit = 10, emotion = null, cursor = null) {
     const params = new URLSearchParams({ skip, limit });
     if (emotion) params.append('emotion', emotion);
+    if (cursor) params.append('cursor', cursor);
     return apiClient.get(`${JOURNAL_BASE}/entries/?${params.toString()}`);
   },
 